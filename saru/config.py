@@ -9,12 +9,15 @@ import abc
 import collections
 import collections.abc
 import copy
+import functools
 import json
 import logging
+import os
 import pathlib
 import re
 import shutil
 import typing as t
+import warnings
 from datetime import datetime
 
 __all__ = (
@@ -39,7 +42,7 @@ __all__ = (
 logger = logging.getLogger(__name__)
 
 CONFIG_PATH_CHAR = "/"
-CONFIG_PATH_SPLIT = re.compile(r"/+")
+CONFIG_PATH_SEGMENT = re.compile(r"[^/]+")
 
 ConfigValueT = t.Union[
     str,
@@ -151,13 +154,17 @@ class NullConfigBackend(ConfigBackendProtocol):
         return {}
 
 
-def cfg_path_parse(path: str) -> t.Sequence[str]:
+@functools.lru_cache(maxsize=4096)
+def cfg_path_parse(path: str) -> t.Tuple[str, ...]:
     """
     Parse a path string into a sequence of config keys.
     Empty strings are ignored, so for example `/foo/bar/` and `foo/bar` are
     the same thing.
+
+    Results are cached, since the same paths are parsed on every config access.
+    The returned sequence is a tuple, and so can't be modified.
     """
-    return [item for item in CONFIG_PATH_SPLIT.split(path) if item]
+    return tuple(CONFIG_PATH_SEGMENT.findall(path))
 
 
 def cfg_path_build(path: t.Sequence[str]) -> str:
@@ -206,24 +213,22 @@ class BaseConfig(Config):
                 or is of invalid type.
         """
         subdata: t.MutableMapping[str, ConfigValueT] = self.__data
-        traversed: t.MutableSequence[str] = []
 
-        # traverse path and find the pointed subdata
-        for path_item in path:
+        # traverse path and find the pointed subdata. The traversed path is
+        # only needed for error messages, so it's sliced out of `path` then.
+        for i, path_item in enumerate(path):
             if path_item not in subdata:
                 if create_subdata:
                     subdata[path_item] = {}
                 else:
-                    self.__subdata_path_error(path, [*traversed, path_item], "does not exist.")
+                    self.__subdata_path_error(path, path[:i + 1], "does not exist.")
 
             # Item exists. Check to see if it's a mapping, so we can continue.
             potential_subdata = subdata[path_item]
             if not isinstance(potential_subdata, collections.abc.MutableMapping):
-                self.__subdata_path_error(path, [*traversed, path_item], "is not a mapping.")
+                self.__subdata_path_error(path, path[:i + 1], "is not a mapping.")
             else:
-                # Success, so update subdata and traversal tracking
                 subdata = potential_subdata
-                traversed.append(path_item)
 
         return subdata
 
@@ -243,12 +248,49 @@ class BaseConfig(Config):
         if not parsed_path:
             raise ConfigPathException(f"Path \"{path}\" does not reference anything. Empty config names are not allowed.")
 
+        return self.__get_subdata_and_key_parsed(parsed_path, create_subdata)
+
+    def __get_subdata_and_key_parsed(
+        self,
+        parsed_path: t.Sequence[str],
+        create_subdata: bool = False
+    ) -> t.Tuple[t.MutableMapping[str, ConfigValueT], str]:
+        """
+        Same as `__get_subdata_and_key`, but for an already parsed, non-empty path.
+        """
         if len(parsed_path) == 1:
             # In the case of one path element, skip the traversal step.
             return self.__data, parsed_path[0]
 
-        *subconfig_path, key = parsed_path
-        return self.__get_subdata(subconfig_path, create_subdata), key
+        return self.__get_subdata(parsed_path[:-1], create_subdata), parsed_path[-1]
+
+    # Item access by already parsed, non-empty paths. Lets BaseSubConfig
+    # prepend its parsed prefix instead of building and re-parsing a path
+    # string on every access.
+
+    def _setitem_parsed(self, parsed_path: t.Sequence[str], value: ConfigValueT) -> None:
+        subconfig, key = self.__get_subdata_and_key_parsed(parsed_path, create_subdata=True)
+        subconfig[key] = value
+
+    def _delitem_parsed(self, parsed_path: t.Sequence[str]) -> None:
+        subconfig, key = self.__get_subdata_and_key_parsed(parsed_path, create_subdata=False)
+        del subconfig[key]
+
+    def _getitem_parsed(self, parsed_path: t.Sequence[str]) -> ConfigValueT:
+        subconfig, key = self.__get_subdata_and_key_parsed(parsed_path, create_subdata=False)
+        return subconfig[key]
+
+    def _contains_parsed(self, parsed_path: t.Sequence[str]) -> bool:
+        # Same walk as _getitem_parsed, but without raising and catching an
+        # exception for every miss.
+        subdata: object = self.__data
+        for path_item in parsed_path:
+            if not isinstance(subdata, collections.abc.MutableMapping) or path_item not in subdata:
+                return False
+
+            subdata = subdata[path_item]
+
+        return True
 
     def sub(self, key: str, ensure_exists: bool = True) -> Config:
         # Attempt to get subdata. This will raise any appropriate exceptions
@@ -283,12 +325,8 @@ class BaseConfig(Config):
 
     def __contains__(self, key: object) -> bool:
         if isinstance(key, str):
-            try:
-                _ = self[key]
-            except (KeyError, ConfigPathException):
-                return False
-
-            return True
+            parsed_path = cfg_path_parse(key)
+            return bool(parsed_path) and self._contains_parsed(parsed_path)
         else:
             logger.warning("BaseConfig: __contains__ attempt with non-str key")
             return False
@@ -300,17 +338,23 @@ class BaseSubConfig(Config):
     be constructed by `BaseConfig`, which does some work to ensure the
     methods defined here are valid.
     """
-    def __init__(self, parent: Config, path: str):
+    def __init__(self, parent: BaseConfig, path: str):
         self.parent = parent
         self.path = path
 
+        # Parsed once here, then prepended to every key.
+        self.__prefix = cfg_path_parse(path)
+
+        if not self.__prefix:
+            raise ConfigPathException(f"Path \"{path}\" does not reference anything. Empty config names are not allowed.")
+
     def write(self) -> None:
         self.parent.write()
 
     def load(self) -> None:
         self.parent.load()
 
-    def __get_true_path(self, path: str) -> str:
+    def __get_true_parsed_path(self, path: str) -> t.Tuple[str, ...]:
         # Parse path to normalize it. If we get nothing, then a blank
         # string or equivalent was passed in, so error.
         parsed = cfg_path_parse(path)
@@ -318,28 +362,31 @@ class BaseSubConfig(Config):
         if not parsed:
             raise ConfigPathException(f"Path \"{path}\" does not reference anything. Empty config names are not allowed.")
 
-        return cfg_path_build([self.path, *parsed])
+        return self.__prefix + parsed
 
     def sub(self, key: str, ensure_exists: bool = True) -> Config:
-        return self.parent.sub(self.__get_true_path(key), ensure_exists=ensure_exists)
+        return self.parent.sub(
+            cfg_path_build(self.__get_true_parsed_path(key)),
+            ensure_exists=ensure_exists
+        )
 
     @property
     def __safe_dict(self) -> t.MutableMapping[str, ConfigValueT]:
         # Assumption: The path pointed to in our parent is a valid mapping.
-        return t.cast(t.MutableMapping[str, ConfigValueT], self.parent[self.path])
+        return t.cast(t.MutableMapping[str, ConfigValueT], self.parent._getitem_parsed(self.__prefix))
 
     @property
     def root(self) -> t.MutableMapping[str, ConfigValueT]:
         return self.__safe_dict
 
     def __setitem__(self, key: str, value: ConfigValueT) -> None:
-        self.parent[self.__get_true_path(key)] = value
+        self.parent._setitem_parsed(self.__get_true_parsed_path(key), value)
 
     def __delitem__(self, key: str) -> None:
-        del self.parent[self.__get_true_path(key)]
+        self.parent._delitem_parsed(self.__get_true_parsed_path(key))
 
     def __getitem__(self, key: str) -> ConfigValueT:
-        return self.parent[self.__get_true_path(key)]
+        return self.parent._getitem_parsed(self.__get_true_parsed_path(key))
 
     def __len__(self) -> int:
         return len(self.__safe_dict)
@@ -349,7 +396,7 @@ class BaseSubConfig(Config):
 
     def __contains__(self, key: object) -> bool:
         if isinstance(key, str):
-            return self.__get_true_path(key) in self.parent
+            return self.parent._contains_parsed(self.__get_true_parsed_path(key))
         else:
             logger.warning("BaseSubConfig: __contains__ attempt with non-str key")
             return False
@@ -376,44 +423,155 @@ class InMemoryConfigBackend(ConfigBackendProtocol):
         return self.__data
 
 
+class _TemplateNode:
+    """
+    A branch in a compiled `ConfigTemplate`. Maps each key to either a
+    child branch, or the value to fill in if the key is missing.
+
+    `default` is the mapping to start the branch with if it's missing, for
+    templates that give both a mapping value and paths below it.
+    """
+    __slots__ = ("entries", "default")
+
+    def __init__(self, default: t.Optional[t.Mapping[str, ConfigValueT]] = None) -> None:
+        self.entries: t.Dict[str, t.Union['_TemplateNode', ConfigValueT]] = {}
+        self.default = default
+
+
 class ConfigTemplate:
     """
     A configuration template. Describes all the configuration
     paths that must exist in a `Config` object and what their initial
     values should be.
+
+    `rollback_on_failure` is deprecated and has no effect. `apply` checks the
+    whole template before changing anything, so a failed apply leaves the
+    config untouched either way.
     """
     def __init__(
         self,
         paths: t.Mapping[str, ConfigValueT],
-        rollback_on_failure: bool = False
+        rollback_on_failure: t.Optional[bool] = None
     ):
+        if rollback_on_failure is not None:
+            warnings.warn(
+                "ConfigTemplate: rollback_on_failure is deprecated and has no effect",
+                DeprecationWarning,
+                stacklevel=2
+            )
+
         self.template = copy.deepcopy(paths)
-        self.rollback_on_failure = rollback_on_failure
 
-    def __rollback(self, config: Config) -> None:
-        """
-        Roll back a config object. Only applies if self.rollback_on_failure
-        is True.
-        """
-        if self.rollback_on_failure:
-            # Load last written data on failure.
-            logger.warning("ConfigTemplate: rolling back...")
-            config.load()
-            logger.warning("ConfigTemplate: rollback success.")
+        # Compile the paths into a tree once, so applying the template
+        # doesn't need to parse and walk every path for every config.
+        self.__tree = _TemplateNode()
+        for path, value in self.template.items():
+            self.__add_path(path, value)
+
+    def __add_path(self, path: str, value: ConfigValueT) -> None:
+        parsed_path = cfg_path_parse(path)
+
+        if not parsed_path:
+            raise ConfigPathException(f"Template path \"{path}\" does not reference anything.")
+
+        *branch_path, key = parsed_path
+        node = self.__tree
+
+        for path_item in branch_path:
+            child = node.entries.get(path_item)
+
+            if child is None:
+                child = node.entries[path_item] = _TemplateNode()
+            elif isinstance(child, collections.abc.Mapping):
+                # A mapping value with paths below it. Keep the mapping as the
+                # branch's starting value.
+                child = node.entries[path_item] = _TemplateNode(default=child)
+            elif not isinstance(child, _TemplateNode):
+                raise ConfigPathException(f"Template path \"{path}\" is below another template value.")
+
+            node = child
+
+        existing = node.entries.get(key)
+
+        if key not in node.entries:
+            node.entries[key] = value
+        elif (
+            isinstance(existing, _TemplateNode)
+            and existing.default is None
+            and isinstance(value, collections.abc.Mapping)
+        ):
+            # Same as above, but the paths below came first.
+            existing.default = value
+        else:
+            raise ConfigPathException(f"Template path \"{path}\" conflicts with another template path.")
+
+    @classmethod
+    def __check_node(
+        cls,
+        node: _TemplateNode,
+        data: t.Mapping[str, ConfigValueT],
+        path: t.Tuple[str, ...]
+    ) -> None:
+        """
+        Make sure the template can be applied to `data` without modifying
+        anything. Raises ConfigPathException if an existing value is in the
+        way of a template branch.
+        """
+        for key, entry in node.entries.items():
+            if not isinstance(entry, _TemplateNode):
+                continue
+
+            # Missing branches are created from their default, so check
+            # against that instead.
+            subdata: object
+            if key in data:
+                subdata = data[key]
+            elif entry.default is not None:
+                subdata = entry.default
+            else:
+                subdata = {}
+
+            if not isinstance(subdata, collections.abc.Mapping):
+                raise ConfigPathException(
+                    f"Could not apply template: Item at \"{cfg_path_build([*path, key])}\" is not a mapping."
+                )
+
+            cls.__check_node(entry, subdata, (*path, key))
+
+    @classmethod
+    def __apply_node(
+        cls,
+        node: _TemplateNode,
+        data: t.MutableMapping[str, ConfigValueT],
+    ) -> None:
+        for key, entry in node.entries.items():
+            if isinstance(entry, _TemplateNode):
+                if key not in data:
+                    data[key] = {} if entry.default is None else copy.deepcopy(dict(entry.default))
+
+                # Checked to be a mapping by __check_node.
+                cls.__apply_node(entry, t.cast(t.MutableMapping[str, ConfigValueT], data[key]))
+            elif key not in data:
+                # Copy, so configs don't end up sharing mutable template values.
+                data[key] = copy.deepcopy(entry)
 
     def apply(self, config: Config) -> None:
         """
         Apply this template to the given config. Does not write anything,
         so on success should be followed up with a call to `Config.write`.
+
+        The template is checked against the config before anything is
+        changed, so a failed apply leaves the config untouched.
         """
-        for path, value in self.template.items():
-            if path not in config:
-                try:
-                    config[path] = value
-                except (ConfigPathException, KeyError):
-                    logger.error(f"ConfigTemplate: Could not apply value {value} to \"{path}\"")
-                    self.__rollback(config)
-                    raise
+        root = config.root
+
+        try:
+            self.__check_node(self.__tree, root, ())
+        except ConfigPathException as e:
+            logger.error(f"ConfigTemplate: {e}")
+            raise
+
+        self.__apply_node(self.__tree, root)
 
 
 class JsonConfigBackend(ConfigBackendProtocol):
@@ -421,6 +579,10 @@ class JsonConfigBackend(ConfigBackendProtocol):
     A configuration backend that stores information in a human-readable
     JSON file.
     """
+    # Suffix added to the config path for the temporary file used when
+    # writing. The temporary file replaces the real one once fully written.
+    TMP_SUFFIX = ".tmp"
+
     def __init__(
         self,
         path: t.Union[str, pathlib.Path],
@@ -454,9 +616,15 @@ class JsonConfigBackend(ConfigBackendProtocol):
                 )
                 raise ConfigException(msg.format(self.path))
 
-        with open(self.path, 'w') as f:
+        # Write to a temporary file first and move it over the real one, so
+        # a crash mid-write never leaves a truncated config behind.
+        tmp_path = self.path.with_name(self.path.name + self.TMP_SUFFIX)
+
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=4)
 
+        os.replace(tmp_path, self.path)
+
         self.__update_last_date()
 
     def read(self) -> t.MutableMapping[str, ConfigValueT]:
@@ -465,7 +633,8 @@ class JsonConfigBackend(ConfigBackendProtocol):
             self.write({})
             return {}
 
-        with open(self.path, 'r') as f:
+        # Don't depend on the locale encoding.
+        with open(self.path, 'r', encoding='utf-8') as f:
             data = dict(json.load(f))
 
         self.__update_last_date()
@@ -482,6 +651,10 @@ class JsonConfigDirectory(t.Mapping[t.Union[int, str], Config]):
         self.data: t.MutableMapping[str, Config] = {}
         self.template = template
 
+        # Bumped whenever config objects are replaced, so anything holding
+        # on to them knows to look them up again.
+        self.generation = 0
+
         # We accept str or pathlib.Path, but internally it's always
         # a Path instance.
         if isinstance(path, str):
@@ -545,8 +718,13 @@ class JsonConfigDirectory(t.Mapping[t.Union[int, str], Config]):
         Read all configuration files within the directory.
         """
         self.data = {}
+        self.generation += 1
 
         for child in self.path.iterdir():
+            # Leftover from an interrupted write, not a config.
+            if child.suffix == JsonConfigBackend.TMP_SUFFIX:
+                continue
+
             try:
                 cid = child.stem
             except ValueError:
@@ -623,6 +801,7 @@ class JsonConfigDirectory(t.Mapping[t.Union[int, str], Config]):
         s_cid = str(cid)
 
         self.data[s_cid] = self.new_config(cid)
+        self.generation += 1
         self.__apply_template(s_cid)
         self.data[s_cid].write()
 
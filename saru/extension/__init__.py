@@ -68,6 +68,12 @@ async def sr(ctx: lightbulb.Context) -> None:
 
 @sr.child()  # type: ignore
 @lightbulb.add_checks(lightbulb.owner_only)
+@lightbulb.option(
+    "concurrency",
+    "How many tests to run at once.",
+    type=int,
+    default=1
+)
 @lightbulb.command(
     "selftest",
     "Perform a test of all built-in saru commands."
@@ -76,7 +82,8 @@ async def sr(ctx: lightbulb.Context) -> None:
 async def selftest(ctx: lightbulb.Context) -> None:
     await saru.basic_selftest_command(
         ctx,
-        *[mod.test_suite for mod in modules]
+        *[mod.test_suite for mod in modules],
+        concurrency=ctx.options.concurrency
     )
 
 
@@ -21,7 +21,7 @@ CfgCommandCallbackT = t.Union[
     CfgValueOperationCallbackT
 ]
 
-test_suite: saru.TestSuite[lightbulb.Context] = saru.TestSuite()
+test_suite: saru.TestSuite[lightbulb.Context] = saru.TestSuite(serial=True)
 saru.add_command_tests(
     test_suite,
     [
@@ -13,8 +13,9 @@ import logging
 import time
 import typing
 from abc import ABC, abstractmethod
-from collections.abc import Coroutine, MutableMapping
+from collections.abc import Coroutine, Iterable, MutableMapping
 from datetime import MAXYEAR, MINYEAR, datetime
+from types import MappingProxyType
 from typing import (Any, Callable, Mapping, Optional, Protocol, Sequence, Type,
                     Union)
 
@@ -110,6 +111,9 @@ class JobHeader:
 
 # Task base class. Subclass this to create your own Tasks.
 class JobTask(ABC):
+    # Empty, so subclasses can use __slots__ too.
+    __slots__ = ()
+
     def __init__(self, *_: typing.Any, **__: typing.Any) -> None: ...
 
     @abstractmethod
@@ -201,6 +205,11 @@ class TaskRegistry:
     # Forces a passed tasktype object to be a string. Also serves to validate
     # a task_type string.
     def force_str(self, tasktype: Union[str, Type[JobTask]]) -> str:
+        # Registered strings are their own task type, so skip the class lookup
+        # and task_type() call for the common case.
+        if isinstance(tasktype, str) and tasktype in self.tasks:
+            return tasktype
+
         return self.get(tasktype).task_type()
 
     # Tests if a task type is in the task registry.
@@ -211,6 +220,8 @@ class TaskRegistry:
 
 # Base JobFactory functionality.
 class JobFactory(ABC):
+    __slots__ = ("id_counter", "task_registry")
+
     def __init__(self, task_registry: TaskRegistry):
         self.id_counter = CountingIdGenerator()
         self.task_registry = task_registry
@@ -269,11 +280,10 @@ class JobCallback(Protocol):
 
 # A single job queue. Can run one job at a time.
 class JobQueue:
+    # If no event loop is given, jobs are run on whichever loop is running
+    # the queue.
     def __init__(self, eventloop: Optional[asyncio.AbstractEventLoop] = None):
-        if eventloop is None:
-            self.loop = asyncio.get_event_loop()
-        else:
-            self.loop = eventloop
+        self.loop = eventloop
 
         self.active_job: Optional[Job] = None
         self.active_task: Optional[asyncio.Task] = None
@@ -295,6 +305,19 @@ class JobQueue:
         await self.job_queue.put(job)
         self.jobs[job.header.id] = job
 
+    # Submit several jobs at once. Jobs are enqueued in the order given.
+    async def submit_jobs(self, jobs: Sequence[Job]) -> None:
+        # Submit callbacks are small, so await them one by one. gather()
+        # would wrap every call in its own Task.
+        if self.job_submit_callback is not None:
+            callback = self.job_submit_callback
+            for j in jobs:
+                await callback(j.header)
+
+        for j in jobs:
+            self.job_queue.put_nowait(j)
+            self.jobs[j.header.id] = j
+
     def on_job_submit(self, callback: JobCallback) -> None:
         self.job_submit_callback = callback
 
@@ -341,17 +364,25 @@ class JobQueue:
 
         # Schedule task
         coro = self.active_job.task.run(self.active_job.header)
-        task = self.loop.create_task(coro)
+        loop = self.loop if self.loop is not None else asyncio.get_running_loop()
+        task = loop.create_task(coro)
         self.active_task = task
 
         if self.job_start_callback:
             await self.job_start_callback(j.header)
 
         try:
-            await task
+            # Shield the job, so a cancelled job can be told apart from the
+            # queue itself being cancelled.
+            await asyncio.shield(task)
         except asyncio.CancelledError:
+            if not task.cancelled():
+                # The queue is shutting down. Take the job down with it.
+                task.cancel()
+                raise
+
             logger.warning("Uncaught CancelledError in job " + str(j.header.id))
-        except:
+        except Exception:
             logger.exception("Got exception while running job")
         finally:
             if self.active_job:
@@ -510,16 +541,29 @@ class CronHeader:
         # See cron_next_date() for more details.
         self.next = cron_next_date_as_datetime(sched_obj, carry=1)
 
-    def match(self, **kwargs: Union[str, int, Mapping]) -> bool:
-        d = self.as_dict()
+    # Keys usable in match(). These are the same keys returned by as_dict().
+    MATCH_KEYS = frozenset((
+        "id", "properties", "task_type", "owner_id", "guild_id", "schedule"
+    ))
 
-        for key, value in kwargs.items():
-            if key not in d:
+    # Raise TypeError if any of the given keys can't be used in match().
+    @classmethod
+    def check_match_keys(cls, keys: Iterable[str]) -> None:
+        for key in keys:
+            if key not in cls.MATCH_KEYS:
                 raise TypeError("Cannot use {} in CronHeader.match".format(
                     key
                 ))
 
-            if d[key] != value:
+    def match(self, **kwargs: Union[str, int, Mapping]) -> bool:
+        self.check_match_keys(kwargs)
+        return self._match_items(kwargs.items())
+
+    # match() without key validation. Compares attributes directly instead of
+    # building the as_dict() mapping for every header.
+    def _match_items(self, items: Iterable[typing.Tuple[str, Any]]) -> bool:
+        for key, value in items:
+            if getattr(self, key) != value:
                 return False
 
         return True
@@ -937,25 +981,59 @@ class JobCron:
                 # check is running.
                 async with self.schedule_lock:
                     await self.mainloop()
-        except:
+        except Exception:
             logger.exception("Scheduler stopped unexpectedly!")
 
     # Single iteration of schedule dispatch.
     async def mainloop(self) -> None:
+        fired = []
+        now = datetime.now()
+
         for id, sheader in self.schedule.items():
             # If we've gone past the scheduled time, fire the job,
             # regenerate the next time using the cron string.
-            if sheader.next and sheader.next < datetime.now():
+            if sheader.next and sheader.next < now:
                 sheader.update_next()
-                await self._start_scheduled_job(sheader)
+                fired.append(sheader)
+
+        # Create jobs for everything that fired this tick concurrently, then
+        # submit them in one go. A job that fails to create is logged and
+        # skipped, rather than dropping every other job fired this tick.
+        if fired:
+            results = await asyncio.gather(
+                *(self.jobfactory.create_job_from_cron(h) for h in fired),
+                return_exceptions=True
+            )
+
+            jobs = []
+            for sheader, result in zip(fired, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Could not create job for schedule {sheader.id}", exc_info=result)
+                elif isinstance(result, BaseException):
+                    raise result
+                else:
+                    jobs.append(result)
+
+            await self.jobqueue.submit_jobs(jobs)
+
+            for job in jobs:
+                self._log_fired_job(job)
+
+    def _log_fired_job(self, job: Job) -> None:
+        # display() is up to the task implementation and may not be cheap,
+        # so skip it entirely if the message would be dropped anyway.
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
+        logger.info(
+            "SCHED %s: Firing job type=%s %s",
+            job.header.schedule_id, job.header.task_type, job.task.display(job.header)
+        )
 
     async def _start_scheduled_job(self, cron_header: CronHeader) -> Job:
         job = await self.jobfactory.create_job_from_cron(cron_header)
-        msg = "SCHED {}: Firing job type={} {}"
-        logger.info(msg.format(
-            cron_header.id, job.header.task_type, job.task.display(job.header)
-        ))
         await self.jobqueue.submit_job(job)
+        self._log_fired_job(job)
 
         return job
 
@@ -966,8 +1044,15 @@ class JobCron:
 
     # Returns a copy of the schedule, filtered by the given parameters.
     def sched_filter(self, **kwargs: Union[int, str, Mapping]) -> Mapping[int, CronHeader]:
+        if not kwargs:
+            return self.sched_copy()
+
+        # Validate once up front, rather than once per schedule entry.
+        CronHeader.check_match_keys(kwargs)
+        items = tuple(kwargs.items())
+
         return {id: c for id, c in self.schedule.items()
-                if c.match(**kwargs)}
+                if c._match_items(items)}
 
     # Returns a copy of the schedule.
     def sched_copy(self) -> Mapping[int, CronHeader]:
@@ -991,42 +1076,52 @@ class JobCron:
 # debugging purposes. For example, you can fill the job queue with BlockerTasks
 # that never end to test proper queue and cancellation behavior.
 class BlockerTask(JobTask):
+    __slots__ = ("end_time",)
+
     # Ignore any arguments passed in to retain compatibility with all job
     # factories.
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__()
-        self.counter = 0
+
+        # Monotonic time at which the blocker will finish. None until started.
+        self.end_time: Optional[float] = None
 
     @classmethod
     def task_type(cls) -> str:
         return "blocker"
 
+    _DEFAULT_PROPERTIES: Mapping = MappingProxyType({
+        "time": 60  # seconds. if None, loops forever.
+    })
+
     @classmethod
     def property_default(cls, properties: Mapping) -> Mapping:
-        return {
-            "time": 60  # seconds. if None, loops forever.
-        }
+        return cls._DEFAULT_PROPERTIES
 
     async def run(self, header: JobHeader) -> None:
-        p = header.properties
-        time = p["time"]
+        duration = header.properties["time"]
 
-        if time is None:
-            while True: 
-                await asyncio.sleep(1)
+        # Sleep through the whole duration in one go. Cancelling the job
+        # interrupts the sleep, so there's no need to wake up periodically.
+        if duration is None:
+            await asyncio.Event().wait()
         else:
-            self.counter = time
-
-            while self.counter > 0:
-                await asyncio.sleep(1)
-                self.counter -= 1
+            self.end_time = time.monotonic() + duration
+            await asyncio.sleep(duration)
 
     def display(self, header: JobHeader) -> str:
-        if header.properties['time'] is None:
+        duration = header.properties['time']
+
+        if duration is None:
             return "time=infinite"
+
+        if self.end_time is None:
+            remaining = duration
         else:
-            return " ".join([
-                f"time={header.properties['time']}",
-                f"remaining={self.counter}"
-            ])
+            remaining = max(0, round(self.end_time - time.monotonic()))
+
+        return " ".join([
+            f"time={duration}",
+            f"remaining={remaining}"
+        ])
 
@@ -1,6 +1,8 @@
 import asyncio
 import contextlib
 import dataclasses
+import io
+import itertools
 import time
 import traceback
 import typing as t
@@ -40,20 +42,15 @@ class TestResult:
         outheader = f"[{'PASS' if self.passed() else 'FAIL'}] {self.testinfo.name} ({self.time:.2f}s)"
         # Unfortunately mypy isn't smart enough to tell that passed() is the same as "self.exc is None".
         # So, use the latter directly here.
-        tb = [] if self.exc is None else traceback.format_exception(
-            type(self.exc),
-            self.exc,
-            self.exc.__traceback__
-        )
+        if self.exc is None:
+            return outheader
 
-        # Annoying quirk here, __traceback__ is a sequence of strings, but each string has multiple
-        # lines in it. We want to add spaces for indentation here, so need to split out each line.
-        tb_lines = "".join(tb).splitlines()
+        # Each chunk yielded by format() may hold multiple lines. We want to add spaces for
+        # indentation here, so need to split out each line.
+        te = traceback.TracebackException.from_exception(self.exc)
+        tb_lines = (" "*4 + line for chunk in te.format() for line in chunk.splitlines())
 
-        return "\n".join([
-            outheader,
-            *[" "*4 + line for line in tb_lines]
-        ])
+        return "\n".join(itertools.chain([outheader], tb_lines))
 
 
 class Test(t.Generic[T]):
@@ -90,15 +87,34 @@ class Test(t.Generic[T]):
 
 
 class TestSuite(t.Generic[T]):
-    def __init__(self) -> None:
+    def __init__(self, serial: bool = False) -> None:
+        """
+        If `serial` is True, tests in this suite always run one at a time,
+        regardless of the concurrency passed to `TestSuite.run`.
+        """
         self.tests: t.MutableSequence[Test] = []
+        self.serial = serial
 
     def test(self, test: Test) -> Test:
         self.tests.append(test)
         return test
 
-    async def run(self, ctx: T) -> t.Sequence[TestResult]:
-        return [await test.run(ctx) for test in self.tests]
+    async def run(self, ctx: T, concurrency: int = 1) -> t.Sequence[TestResult]:
+        """
+        Run all tests in this suite. By default tests are run in sequence. If
+        `concurrency` is greater than 1, up to that many tests will run at
+        once. Results are returned in the order the tests were added.
+        """
+        if concurrency <= 1 or self.serial:
+            return [await test.run(ctx) for test in self.tests]
+
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _run(test: Test) -> TestResult:
+            async with sem:
+                return await test.run(ctx)
+
+        return await asyncio.gather(*(_run(test) for test in self.tests))
 
 
 def as_selftest(
@@ -145,25 +161,34 @@ def format_test_time(seconds: float) -> str:
     return formatted
 
 
-def format_test_result(results: t.Sequence[TestResult]) -> str:
+def _write_test_result(buf: t.TextIO, results: t.Sequence[TestResult]) -> None:
     """
-    Formats the result of a test suite into text suitable for a discord message.
+    Streaming version of `format_test_result`. Writes the formatted results to `buf`.
     """
-    passed = []
-    failed = []
+    passed: t.List[TestResult] = []
+    failed: t.List[TestResult] = []
 
     total_time = 0.0
 
     for result in results:
-        passed.append(str(result)) if result.passed() else failed.append(str(result))
+        (passed if result.exc is None else failed).append(result)
         total_time += result.time
 
-    return "\n".join([
-        *failed,
-        *passed,
-        "",
-        f"Total time: {format_test_time(total_time)}"
-    ])
+    # Failures first, so they're easy to spot.
+    for result in itertools.chain(failed, passed):
+        buf.write(str(result))
+        buf.write("\n")
+
+    buf.write(f"\nTotal time: {format_test_time(total_time)}")
+
+
+def format_test_result(results: t.Sequence[TestResult]) -> str:
+    """
+    Formats the result of a test suite into text suitable for a discord message.
+    """
+    buf = io.StringIO()
+    _write_test_result(buf, results)
+    return buf.getvalue()
 
 
 # LIGHTBULB SPECIFIC
@@ -222,17 +247,22 @@ def add_command_tests(
 
 
 async def send_test_result_response(ctx: lightbulb.Context, results: t.Sequence[TestResult]) -> None:
-    await util.respond_code_or_txt(ctx, "\n".join([
-        "Tests complete. Results:",
-        "",
-        format_test_result(results)
-    ]))
+    buf = io.StringIO()
+    buf.write("Tests complete. Results:\n\n")
+    _write_test_result(buf, results)
+
+    await util.respond_code_or_txt(ctx, buf.getvalue())
 
 
-async def basic_selftest_command(ctx: lightbulb.Context, *suites: TestSuite) -> None:
+async def basic_selftest_command(
+    ctx: lightbulb.Context,
+    *suites: TestSuite,
+    concurrency: int = 1
+) -> None:
     """
     Implementation for a very basic selftest command. Runs each suite in sequence,
     collects their results, and presents the test results to the user.
+    `concurrency` is passed on to `TestSuite.run`.
 
     See `saru.extension.__init__.selftest` for a use of this function.
 
@@ -247,6 +277,6 @@ async def basic_selftest_command(ctx: lightbulb.Context, *suites: TestSuite) ->
     """
     results: t.MutableSequence[TestResult] = []
     for suite in suites:
-        results += await suite.run(ctx)
+        results += await suite.run(ctx, concurrency)
 
     await saru.send_test_result_response(ctx, results)
@@ -1,6 +1,6 @@
 import copy
+import functools
 import json
-import numbers
 import textwrap
 from collections.abc import Mapping
 from typing import Optional, Sequence, Union
@@ -9,13 +9,20 @@ import hikari
 import lightbulb
 
 # Character to use to acknowledge commands. Defaults to a check mark.
+# Stored in the form used in reaction requests, so hikari can pass it
+# through as-is.
 __ack_char: str = "\U00002705"
 
 
 def override_ack_emoji(emoji: str) -> None:
+    """
+    Set the emoji used by `ack`. Accepts a unicode emoji, or a custom
+    emoji mention such as `<:name:id>`.
+    """
     global __ack_char
 
-    __ack_char = emoji
+    # Normalize once here rather than on every ack.
+    __ack_char = hikari.Emoji.parse(emoji).url_name
 
 
 async def ack(ctx: lightbulb.Context) -> None:
@@ -27,23 +34,20 @@ async def ack(ctx: lightbulb.Context) -> None:
 
 
 def code(s: str, lang: str = "") -> str:
-    # Note: Not using any format()s here, so we can construct format strings
-    # using the util.code* funcs
-    return "".join([
-        "```",
-        lang,
-        "\n",
-        s,
-        "\n```"
-    ])
+    # Note: Braces in s are kept as-is (no format() is applied to s), so we
+    # can construct format strings using the util.code* funcs
+    return f"```{lang}\n{s}\n```"
 
 
 def codelns(lns: Sequence[str], lang: str = "") -> str:
-    return code("\n".join(lns), lang)
+    body = "\n".join(lns)
+    return f"```{lang}\n{body}\n```"
 
 
 def codejson(j: Mapping) -> str:
-    return code(json.dumps(j, indent=4), lang="json")
+    # Non-ASCII text is shown as-is rather than as \u escapes, since this is
+    # meant to be read in Discord.
+    return code(json.dumps(j, indent=4, ensure_ascii=False), lang="json")
 
 
 def longstr_fix(s: str) -> str:
@@ -51,7 +55,13 @@ def longstr_fix(s: str) -> str:
 
 
 def longstr_oneline(s: str) -> str:
-    return " ".join(longstr_fix(s).split("\n"))
+    # Splitting on any whitespace handles dedent, strip, and newline joining
+    # in a single pass.
+    return " ".join(s.split())
+
+
+# Longest text that still fits in a discord message once wrapped by code().
+_CODE_TEXT_LIMIT = 2000 - len(code(""))
 
 
 async def respond_code_or_txt(ctx: lightbulb.Context, text: str) -> None:
@@ -59,10 +69,10 @@ async def respond_code_or_txt(ctx: lightbulb.Context, text: str) -> None:
     Respond to a message with code. By default, `text` will be enclosed in ``` and posted.
     If that message would be too large, it will be sent as a text file instead.
     """
-    msg = code(text)
-
-    if len(msg) <= 2000:
-        await ctx.respond(msg)
+    # Check the length up front, so oversized text is never copied into
+    # a code block just to be thrown away.
+    if len(text) <= _CODE_TEXT_LIMIT:
+        await ctx.respond(code(text))
         return
 
     # Too big, so send as file instead.
@@ -72,6 +82,15 @@ async def respond_code_or_txt(ctx: lightbulb.Context, text: str) -> None:
     )
 
 
+@functools.lru_cache(maxsize=256)
+def _split_command(command: str) -> tuple[str, str]:
+    # Split a command string into the name it's invoked with and its
+    # arguments. Cached, since aliases and self-tests invoke the same
+    # command strings over and over.
+    invoked_with, *args = command.strip().split(maxsplit=1)
+    return invoked_with, args[0] if args else ""
+
+
 async def invoke_prefix_command(
     ctx: lightbulb.PrefixContext,
     command: str
@@ -83,14 +102,15 @@ async def invoke_prefix_command(
     Useful for implementing aliases, or for testing.
     """
     invoked_prefix = ctx.prefix
-    invoked_with, *args = command.strip().split(maxsplit=1)
+    invoked_with, args = _split_command(command)
     command_obj = ctx.bot.get_prefix_command(invoked_with)
 
     if command_obj is None:
         raise ValueError(f"Could not find command named \"{invoked_with}\"")
 
-    # Need to override the content of the message event
-    new_message = copy.deepcopy(ctx.event.message)
+    # Need to override the content of the message event. A shallow copy is
+    # enough, since only the content is replaced.
+    new_message = copy.copy(ctx.event.message)
     new_message.content = invoked_prefix + command
 
     if isinstance(ctx.event, (hikari.GuildMessageCreateEvent, hikari.DMMessageCreateEvent)):
@@ -105,18 +125,15 @@ async def invoke_prefix_command(
 
     new_ctx = lightbulb.PrefixContext(ctx.bot, new_event, command_obj, invoked_with, invoked_prefix)
 
-    new_ctx._parser = (command_obj.parser or lightbulb.utils.Parser)(
-        new_ctx,
-        args[0] if args else ""
-    )
+    new_ctx._parser = (command_obj.parser or lightbulb.utils.Parser)(new_ctx, args)
 
     await command_obj.invoke(new_ctx)
 
 
 def rangelimit(
-    low: Optional[numbers.Real],
-    val: numbers.Real,
-    high: Optional[numbers.Real],
+    low: Optional[float],
+    val: float,
+    high: Optional[float],
     valname: Optional[str]
 ) -> None:
     """Check if val is between low and high. If not, raise a RangeLimitError."""
@@ -124,36 +141,18 @@ def rangelimit(
     if low is None and high is None:
         raise ValueError("low and high cannot both be None")
 
-    if not (__rangecheck_lower(low, val) and __rangecheck_upper(high, val)):
+    # Written as "not in range" rather than "below low or above high", so NaN
+    # (which fails every comparison) is rejected.
+    if not ((low is None or low <= val) and (high is None or val <= high)):
         raise RangeLimitError(low, val, high, valname)
 
 
-def __rangecheck_lower(
-        low: Optional[numbers.Real],
-        val: numbers.Real
-) -> bool:
-    if low is None:
-        return True
-
-    return low <= val
-
-
-def __rangecheck_upper(
-        high: Optional[numbers.Real],
-        val: numbers.Real
-) -> bool:
-    if high is None:
-        return True
-
-    return val <= high
-
-
 class RangeLimitError(Exception):
     def __init__(
         self,
-        low: Optional[numbers.Real],
-        val: numbers.Real,
-        high: Optional[numbers.Real],
+        low: Optional[float],
+        val: float,
+        high: Optional[float],
         valname: Optional[str]
     ):
         self.low = low
@@ -1,10 +1,11 @@
 import asyncio
-import functools
 import logging
 import os
 import pathlib
 import time
 import typing
+import weakref
+from collections import OrderedDict
 from collections.abc import Coroutine, Iterator, Mapping, MutableMapping
 from types import MappingProxyType
 from typing import Any, Optional, Protocol, Type, TypeVar, Union, cast
@@ -33,9 +34,15 @@ def attach(
     bot.d.saru = saru
 
     # Events
-    bot.subscribe(hikari.StartedEvent, saru.on_bot_ready)
-    bot.subscribe(hikari.GuildJoinEvent, saru.on_bot_guild_join)
-    bot.subscribe(hikari.GuildLeaveEvent, saru.on_bot_guild_leave)
+    subscriptions = (
+        (hikari.StartedEvent, saru.on_bot_ready),
+        (hikari.GuildJoinEvent, saru.on_bot_guild_join),
+        (hikari.GuildLeaveEvent, saru.on_bot_guild_leave),
+        (hikari.StoppingEvent, saru.on_bot_stopping),
+    )
+
+    for event_type, callback in subscriptions:
+        bot.subscribe(event_type, callback)
 
 
 SaruAttachedT = Union[
@@ -44,50 +51,105 @@ SaruAttachedT = Union[
 ]
 
 
-def single_dispatch_error(f_name: str, obj: Any) -> typing.NoReturn:
-    raise NotImplementedError(f"{__name__}.{f_name}(...) not implemented for {type(obj)}")
-
-
 # Get the attached instance of Saru from context.
-@functools.singledispatch
 def get(saru_attached: SaruAttachedT) -> 'Saru':
-    return typing.cast(Saru, single_dispatch_error("get", saru_attached))
+    if isinstance(saru_attached, lightbulb.Context):
+        return typing.cast(Saru, saru_attached.bot.d.saru)
+    if isinstance(saru_attached, lightbulb.BotApp):
+        return typing.cast(Saru, saru_attached.d.saru)
 
+    raise NotImplementedError(f"{__name__}.get(...) not implemented for {type(saru_attached)}")
 
-@get.register(lightbulb.Context)
-def _(saru_attached: lightbulb.Context) -> 'Saru':
-    return typing.cast(Saru, saru_attached.bot.d.saru)
 
+# Get a guild ID from anything that identifies a guild. Checks are ordered
+# by how often each type is passed in.
+def guild_id_from_entity(entity: GuildEntity) -> int:
+    if isinstance(entity, int):
+        return entity
+    if isinstance(entity, hikari.Guild):
+        return entity.id
+    if isinstance(entity, lightbulb.Context):
+        if entity.guild_id is None:
+            raise ValueError("this context does not have guild_id")
 
-@get.register(lightbulb.BotApp)
-def _(saru_attached: lightbulb.BotApp) -> 'Saru':
-    return typing.cast(Saru, saru_attached.d.saru)
+        return entity.guild_id
 
+    raise NotImplementedError(f"{__name__}.guild_id_from_entity(...) not implemented for {type(entity)}")
 
-@functools.singledispatch
-def guild_id_from_entity(entity: GuildEntity) -> int:
-    return typing.cast(int, single_dispatch_error("get", entity))
 
+SARU_INTERNAL_CFG = "__saru_internal"
 
-@guild_id_from_entity.register(int)
-def _(entity: int) -> int:
-    return entity
 
+# Coalesces config writes. Configs marked dirty are written out together
+# FLUSH_DELAY seconds after the first mark, so a burst of job events
+# results in a single write per config instead of one write per event.
+class _DirtyWriter:
+    FLUSH_DELAY = 0.05  # SECONDS
 
-@guild_id_from_entity.register(hikari.Guild)
-def _(entity: hikari.Guild) -> int:
-    return entity.id
+    def __init__(self) -> None:
+        # Config objects are mutable mappings, and so aren't hashable.
+        # Key them by identity instead.
+        self.__dirty: MutableMapping[int, config.Config] = {}
+        self.__flush_handle: Optional[asyncio.TimerHandle] = None
 
+    # Mark a config as needing a write. Must be called from within the
+    # event loop.
+    def mark(self, cfg: config.Config) -> None:
+        self.__dirty[id(cfg)] = cfg
 
-@guild_id_from_entity.register(lightbulb.Context)
-def _(entity: lightbulb.Context) -> int:
-    if entity is None:
-        raise ValueError("this context does not have guild_id")
+        if self.__flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self.__flush_handle = loop.call_later(self.FLUSH_DELAY, self.flush)
 
-    return cast(int, entity.guild_id)
+    # Write all dirty configs right away.
+    def flush(self) -> None:
+        if self.__flush_handle is not None:
+            self.__flush_handle.cancel()
+            self.__flush_handle = None
 
+        dirty, self.__dirty = self.__dirty, {}
 
-SARU_INTERNAL_CFG = "__saru_internal"
+        for cfg in dirty.values():
+            try:
+                cfg.write()
+            except Exception:
+                logger.exception("Failed to write config")
+
+
+# Per-guild config lookup cache for a config directory. Skips the repeated
+# ensure_exists() + lookup on every access. The whole cache is dropped
+# whenever the directory replaces its config objects, e.g. on load() or
+# create_config().
+class _ConfigCache:
+    def __init__(self, directory: config.JsonConfigDirectory) -> None:
+        self.directory = directory
+        self.__cache: MutableMapping[int, config.Config] = {}
+        self.__generation = directory.generation
+
+    # Get the config for a guild, creating it if it doesn't exist.
+    def get(self, guild_id: int) -> config.Config:
+        if self.__generation != self.directory.generation:
+            self.__cache.clear()
+            self.__generation = self.directory.generation
+
+        try:
+            return self.__cache[guild_id]
+        except KeyError:
+            self.directory.ensure_exists(guild_id)
+            cfg = self.__cache[guild_id] = self.directory[guild_id]
+            return cfg
+
+    def discard(self, guild_id: int) -> None:
+        self.__cache.pop(guild_id, None)
+
+    # Drop cached configs for every guild not in guild_ids. Returns the IDs
+    # of the dropped guilds.
+    def retain(self, guild_ids: typing.AbstractSet[int]) -> typing.List[int]:
+        removed = [g for g in self.__cache if g not in guild_ids]
+        for guild_id in removed:
+            del self.__cache[guild_id]
+
+        return removed
 
 
 class Saru:
@@ -101,12 +163,19 @@ class Saru:
         bot: lightbulb.BotApp,
         config_path: pathlib.Path,
         guild_cfgtemplate: config.ConfigTemplate,
-        common_cfgtemplate: Mapping[str, config.ConfigTemplate] = MappingProxyType({})
+        common_cfgtemplate: Mapping[str, config.ConfigTemplate] = MappingProxyType({}),
+        resume_concurrency: Optional[int] = None
     ):
         self.bot = bot
-        self.loop = asyncio.get_event_loop()
         self.config_path = config_path
 
+        if resume_concurrency is None:
+            resume_concurrency = self.RESUME_CONCURRENCY
+        elif resume_concurrency < 1:
+            raise ValueError("resume_concurrency must be at least 1")
+
+        self.resume_concurrency = resume_concurrency
+
         self.__guild_cfgtemplate = guild_cfgtemplate
 
         self.__common_cfgtemplate: typing.MutableMapping = dict(common_cfgtemplate)
@@ -133,7 +202,6 @@ class Saru:
         self.job_db = config.JsonConfigDirectory(
             config_path / "jobdb",
             template=config.ConfigTemplate(
-                rollback_on_failure=True,
                 paths={
                     "jobs": {},
                     "cron": {}
@@ -141,21 +209,31 @@ class Saru:
             )
         )
         self.job_db.load()
+
+        # Per-guild config lookup caches for gcfg() and get_jobcfg_for_header().
+        self.__gcfg_cache = _ConfigCache(self.guild_config_directory)
+        self.__jobcfg_cache = _ConfigCache(self.job_db)
+
         self.gs_db = GuildStateDB(self.bot)
+        self.__dirty = _DirtyWriter()
 
         self.common_config_directory.ensure_exists(SARU_INTERNAL_CFG)
         self.monkycfg = self.common_config_directory[SARU_INTERNAL_CFG]
 
+        # In-memory copy of monkycfg's last_schedule_id, so schedule creation
+        # doesn't need to read it back from the config.
+        self.__last_schedule_id = cast(int, self.monkycfg["last_schedule_id"])
+
         # Task registry
         self.task_registry = job.TaskRegistry()
 
         # Job executor/consumer component
-        self.jobqueue = job.JobQueue(self.loop)
+        self.jobqueue = job.JobQueue()
         self.jobqueue.on_job_submit(self._cfg_job_create)
         self.jobqueue.on_job_stop(self._cfg_job_delete)
         self.jobqueue.on_job_cancel(self._cfg_job_delete)
         self.jobfactory = DiscordJobFactory(self.task_registry, self.bot)
-        self.jobtask = None
+        self.jobtask: Optional[asyncio.Task] = None
 
         # Job scheduler component
         self.jobcron = job.JobCron(self.jobqueue, self.jobfactory)
@@ -163,22 +241,79 @@ class Saru:
         self.jobcron.on_delete_schedule(self._cfg_sched_delete)
         self.cronfactory = DiscordCronFactory(
             self.task_registry,
-            cast(int, self.monkycfg["last_schedule_id"]) + 1
+            self.__last_schedule_id + 1
         )
-        self.crontask = None
+        self.crontask: Optional[asyncio.Task] = None
+
+        # Guild state sweeper, see sweep_guilds(). Guilds joined since the
+        # last sweep started are tracked, since the guild list fetched by a
+        # sweep may miss them.
+        self.sweeptask: Optional[asyncio.Task] = None
+        self.__joined_since_sweep: typing.Set[int] = set()
 
         self.is_ready = False
 
-        # Create job consumer and scheduler
-        loop = self.loop
-        self.jobtask = loop.create_task(self.jobqueue.run())
-        self.crontask = loop.create_task(self.jobcron.run())
+    async def start(self) -> None:
+        """Start the job consumer, scheduler and guild state sweeper on the
+        running event loop. Called from on_bot_ready(). Does nothing if already
+        started."""
+        if self.jobtask is not None:
+            return
+
+        loop = asyncio.get_running_loop()
+        self.jobtask = loop.create_task(self.jobqueue.run(), name="saru.jobqueue")
+        self.crontask = loop.create_task(self.jobcron.run(), name="saru.jobcron")
+        self.sweeptask = loop.create_task(self.__sweep_loop(), name="saru.guildsweep")
+
+        self.jobtask.add_done_callback(self.__on_bg_task_done)
+        self.crontask.add_done_callback(self.__on_bg_task_done)
+        self.sweeptask.add_done_callback(self.__on_bg_task_done)
+
+    # Seconds between guild state sweeps.
+    GUILD_SWEEP_INTERVAL = 6 * 60 * 60
+
+    async def __sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.GUILD_SWEEP_INTERVAL)
+
+            try:
+                await self.sweep_guilds()
+            except Exception:
+                logger.exception("Guild state sweep failed, retrying next interval")
+
+    async def sweep_guilds(self) -> None:
+        """Drop guild state and cached configs for guilds the bot is no longer
+        in. Catches up on guild leave events that were missed, e.g. while
+        disconnected. Runs periodically once Saru is started."""
+        self.__joined_since_sweep.clear()
+        guild_ids: typing.Set[int] = {guild.id async for guild in self.bot.rest.fetch_my_guilds()}
+
+        # Never sweep a guild joined while the list was being fetched.
+        guild_ids |= self.__joined_since_sweep
+
+        removed = set(self.gs_db.sweep_missing(guild_ids))
+        removed.update(self.__gcfg_cache.retain(guild_ids))
+        removed.update(self.__jobcfg_cache.retain(guild_ids))
+
+        for guild_id in removed:
+            self.jobfactory.purge_guild(guild_id)
+
+    # The background tasks are meant to run for the lifetime of the bot, so
+    # make it loud if one ends.
+    @staticmethod
+    def __on_bg_task_done(task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+
+        exc = task.exception()
+        if exc is not None:
+            logger.error(f"Background task {task.get_name()} died", exc_info=exc)
+        else:
+            logger.error(f"Background task {task.get_name()} exited unexpectedly")
 
     # Get the config object for a given job/cron header.
     def get_jobcfg_for_header(self, header: Union[job.JobHeader, job.CronHeader]) -> config.Config:
-        self.job_db.ensure_exists(header.guild_id)
-        cfg = self.job_db[header.guild_id]
-        return cfg
+        return self.__jobcfg_cache.get(header.guild_id)
 
     # INTERNAL JOB EVENTS
 
@@ -186,7 +321,7 @@ class Saru:
     async def _cfg_job_create(self, header: job.JobHeader) -> None:
         cfg = self.get_jobcfg_for_header(header)
         cfg[f"jobs/{header.id}"] = header.as_dict()
-        cfg.write()
+        self.__dirty.mark(cfg)
 
     # Once a job is done, delete it from the config db.
     async def _cfg_job_delete(self, header: job.JobHeader) -> None:
@@ -194,18 +329,22 @@ class Saru:
         path = f"jobs/{header.id}"
         if path in cfg:
             del cfg[path]
-            cfg.write()
+            self.__dirty.mark(cfg)
 
     # Add created schedules to the config DB, and increase the
     # last_schedule_id parameter.
     async def _cfg_sched_create(self, header: job.CronHeader) -> None:
         cfg = self.get_jobcfg_for_header(header)
         cfg[f"cron/{header.id}"] = header.as_dict()
-        cfg.write()
+        self.__dirty.mark(cfg)
 
-        last_id = cast(int, self.monkycfg["last_schedule_id"])
-        self.monkycfg["last_schedule_id"] = max(last_id, header.id)
-        self.monkycfg.write()
+        # Only touch the internal config if the ID actually moved forward.
+        # Reloaded schedules never do. The write itself is left to the dirty
+        # writer, so a burst of new schedules is persisted once.
+        if header.id > self.__last_schedule_id:
+            self.__last_schedule_id = header.id
+            self.monkycfg["last_schedule_id"] = header.id
+            self.__dirty.mark(self.monkycfg)
 
     # Remove deleted schedules from the config DB.
     async def _cfg_sched_delete(self, header: job.CronHeader) -> None:
@@ -213,25 +352,61 @@ class Saru:
         path = f"cron/{header.id}"
         if path in cfg:
             del cfg[path]
-            cfg.write()
+            self.__dirty.mark(cfg)
 
     # DISCORD LINKS
 
+    # Default maximum number of jobs created concurrently by resume_jobs().
+    # Creating a job may fetch its guild over REST, so avoid bursting every
+    # request at once. Can be overridden with Saru(resume_concurrency=...).
+    RESUME_CONCURRENCY = 32
+
     # Resume all jobs that never properly finished from the last run.
     # Called from on_ready() to ensure that all discord state is init'd
     # properly
     async def resume_jobs(self) -> None:
+        headers: list[Mapping] = []
+
         for guild_id, cfg in self.job_db.items():
-            # Get a copy of the job dict and clear it.
-            jobs = dict(cfg.sub("jobs").root)
+            # Swap the job dict out for an empty one. Resubmitted jobs are
+            # added back through _cfg_job_create, and the whole thing is
+            # written out once by the dirty writer.
+            jobs = cfg.sub("jobs").root
             cfg["jobs"] = {}
-            cfg.write()
+            self.__dirty.mark(cfg)
+
+            headers.extend(typing.cast(Mapping, h) for h in jobs.values())
+
+            # Get the guild fetch going while the rest of the DB is read.
+            if jobs:
+                self.jobfactory.prefetch_guild(int(guild_id))
+
+            logger.info("Resuming %d unfinished job(s) in guild %s", len(jobs), guild_id)
+
+        # Create all jobs concurrently, then submit them in their original
+        # order. A job that fails to resume is logged and dropped, rather
+        # than aborting every job after it.
+        sem = asyncio.Semaphore(self.resume_concurrency)
+
+        async def create(header: Mapping) -> job.Job:
+            async with sem:
+                return await self.jobfactory.create_job_from_dict(header)
 
-            for job_id, job_header in jobs.items():
-                await self.resume_job(typing.cast(Mapping, job_header))
+        results = await asyncio.gather(
+            *(create(h) for h in headers),
+            return_exceptions=True
+        )
+
+        resumed = []
+        for header, result in zip(headers, results):
+            if isinstance(result, Exception):
+                logger.error(f"Could not resume job {header}", exc_info=result)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                resumed.append(result)
 
-            msg = "Resumed {} unfinished job(s) in guild {}"
-            logger.info(msg.format(len(jobs), guild_id))
+        await self.jobqueue.submit_jobs(resumed)
 
     # Resume job from a loaded job header dict.
     async def resume_job(self, header: Mapping) -> None:
@@ -241,57 +416,101 @@ class Saru:
     # Reschedule all cron entries from cfg
     async def reschedule_all_cron(self) -> None:
         for guild_id, cfg in self.job_db.items():
-            crons = dict(cfg.sub("cron").root)
+            crons = cfg.sub("cron").root
             cfg["cron"] = {}
-            cfg.write()
+            self.__dirty.mark(cfg)
 
+            # Schedules are added one by one under the scheduler's lock anyway,
+            # so just make sure a single bad entry doesn't stop the rest.
+            # Failed entries are put back as-is, so they aren't lost on the next write.
             for sched_id, sched_header in crons.items():
-                await self.reschedule_cron(typing.cast(Mapping, sched_header))
+                try:
+                    await self.reschedule_cron(typing.cast(Mapping, sched_header))
+                except Exception:
+                    logger.exception(f"Could not reschedule cron entry {sched_id}")
+                    path = f"cron/{sched_id}"
+                    if path not in cfg:
+                        cfg[path] = sched_header
+                        self.__dirty.mark(cfg)
 
-            msg = "Loaded {} schedule(s) in guild {}"
-            logger.info(msg.format(len(crons), guild_id))
+            logger.info("Loaded %d schedule(s) in guild %s", len(crons), guild_id)
 
     async def reschedule_cron(self, header_dict: Mapping) -> None:
         header = await self.cronfactory.create_cronheader_from_dict(header_dict)
         await self.jobcron.create_schedule(header)
 
     async def join_guilds_offline(self) -> None:
-        """Create config entries for any guilds that were joined while offline."""
+        """Log the guilds the bot is in, including any joined while offline.
+
+        Config entries are not created here. Guild configs and job DB entries
+        are created on first use, so guilds that never use the bot don't get
+        config files."""
         # TODO Investigate bug in fetch_my_guilds: newest_first appears to repeat guilds?
+        # Skip repeats, so each guild is only reported once either way.
+        seen: typing.Set[hikari.Snowflake] = set()
+
         async for guild in self.bot.rest.fetch_my_guilds():
-            logger.info("In guilds: {}({})".format(guild.name, guild.id))
-            self.guild_config_directory.ensure_exists(guild.id)
-            self.job_db.ensure_exists(guild.id)
+            if guild.id in seen:
+                continue
 
-        self.guild_config_directory.write()
-        self.job_db.write()
+            seen.add(guild.id)
+            logger.info("In guilds: %s(%s)", guild.name, guild.id)
 
     async def on_bot_ready(self, event: hikari.StartedEvent) -> None:
         """Function to call when bot is started and connected. This function MUST be called in order for jobs to
         resume properly."""
         if not self.is_ready:
-            await self.reschedule_all_cron()
-            await self.resume_jobs()
-            await self.join_guilds_offline()
+            await self.start()
+
+            # These steps don't depend on each other, so run them together.
+            # Wait for all of them before raising the first failure, so
+            # nothing is left running in the background.
+            results = await asyncio.gather(
+                self.reschedule_all_cron(),
+                self.resume_jobs(),
+                self.join_guilds_offline(),
+                return_exceptions=True
+            )
+
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
 
             self.is_ready = True
 
+            # Nothing left to do on later StartedEvents, so stop listening.
+            # Not subscribed if attach() wasn't used.
+            try:
+                self.bot.unsubscribe(hikari.StartedEvent, self.on_bot_ready)
+            except ValueError:
+                pass
+
         logger.info("Saru ready.")
 
     async def on_bot_guild_join(self, event: hikari.GuildJoinEvent) -> None:
         """Optional guild join event handler."""
         g = event.guild
-        logger.info(f"Joined new guild: {g.name}({g.id})")
+        logger.info("Joined new guild: %s(%s)", g.name, g.id)
+        self.__joined_since_sweep.add(g.id)
 
     async def on_bot_guild_leave(self, event: hikari.GuildLeaveEvent) -> None:
         """Guild leave event handler. Must be fired in order to avoid corruption of guild state DB."""
         g = event.old_guild
         if g is None:
-            logger.info(f"Left guild: {event.guild_id}(cache miss)")
+            logger.info("Left guild: %s(cache miss)", event.guild_id)
         else:
-            logger.info(f"Left guild: {g.name}({g.id}")
+            logger.info("Left guild: %s(%s)", g.name, g.id)
 
         await self.gs_db.delete(event.guild_id)
+        self.__dirty.flush()
+
+        self.__gcfg_cache.discard(event.guild_id)
+        self.__jobcfg_cache.discard(event.guild_id)
+        self.jobfactory.purge_guild(event.guild_id)
+
+    async def on_bot_stopping(self, event: hikari.StoppingEvent) -> None:
+        """Stopping event handler. Writes out any pending job DB changes."""
+        self.__dirty.flush()
 
     # Enqueue a new job. Returns the created job object.
     async def start_job(
@@ -341,10 +560,16 @@ class Saru:
         force_create: bool = False
     ) -> config.Config:
         """Shortcut to get guild cfg, or a subconfig of one."""
+        return self._gcfg_by_id(guild_id_from_entity(guild_entity), path, force_create)
 
-        id = guild_id_from_entity(guild_entity)
-        self.guild_config_directory.ensure_exists(id)
-        cfg = self.guild_config_directory[id]
+    # Implementation of gcfg() for an already resolved guild ID.
+    def _gcfg_by_id(
+        self,
+        id: int,
+        path: Optional[str] = None,
+        force_create: bool = False
+    ) -> config.Config:
+        cfg = self.__gcfg_cache.get(id)
 
         if path is None:
             return cfg
@@ -389,7 +614,7 @@ class Saru:
             else:
                 sub_path = config.cfg_path_build(rest)
 
-            return self.gcfg(guild_entity, sub_path, force_create)
+            return self._gcfg_by_id(guild_id_from_entity(guild_entity), sub_path, force_create)
         elif pathtype == "c":
             if not rest:
                 raise config.ConfigException("must provide config name for c/... path")
@@ -406,6 +631,12 @@ class Saru:
     async def gs(self, state_type: Type[GuildStateTV], guild_entity: GuildEntity) -> GuildStateTV:
         return await self.gs_db.get(state_type, guild_entity)
 
+    # Synchronous version of gs() that only returns existing guild states.
+    # Returns None if the state hasn't been created yet, in which case gs()
+    # must be awaited instead.
+    def gs_cached(self, state_type: Type[GuildStateTV], guild_entity: GuildEntity) -> Optional[GuildStateTV]:
+        return self.gs_db.get_cached(state_type, guild_entity)
+
 
 ######################################
 # JOB INFRASTRUCTURE IMPLEMENTATIONS #
@@ -414,6 +645,8 @@ class Saru:
 
 # Implementation of discord-specific aspects of constructing job objects.
 class DiscordJobFactory(job.JobFactory):
+    __slots__ = ("bot", "__guild_cache", "__guild_fetches")
+
     def __init__(
         self,
         task_registry: job.TaskRegistry,
@@ -422,6 +655,63 @@ class DiscordJobFactory(job.JobFactory):
         super().__init__(task_registry)
         self.bot = bot
 
+        # Guilds fetched over REST, keyed by ID. Avoids refetching the same
+        # guild for every job created in it, e.g. when resuming jobs.
+        self.__guild_cache: MutableMapping[int, hikari.Guild] = {}
+
+        # In-flight REST fetches, keyed by guild ID. Concurrent lookups for the
+        # same guild share a single fetch.
+        self.__guild_fetches: MutableMapping[int, asyncio.Task[hikari.Guild]] = {}
+
+    def __cached_guild(self, guild_id: int) -> Optional[hikari.Guild]:
+        guild: Optional[hikari.Guild] = self.bot.cache.get_guild(guild_id)
+        if guild is None:
+            guild = self.__guild_cache.get(guild_id)
+
+        return guild
+
+    async def __fetch_guild(self, guild_id: int) -> hikari.Guild:
+        try:
+            guild = await self.bot.rest.fetch_guild(guild_id)
+            self.__guild_cache[guild_id] = guild
+            return guild
+        finally:
+            self.__guild_fetches.pop(guild_id, None)
+
+    def __guild_fetch_task(self, guild_id: int) -> asyncio.Task[hikari.Guild]:
+        task = self.__guild_fetches.get(guild_id)
+
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self.__fetch_guild(guild_id))
+            self.__guild_fetches[guild_id] = task
+
+            # Prefetches may never be awaited. Retrieve the exception so a
+            # failed one isn't reported as unhandled; get_guild() still raises it.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        return task
+
+    # Start fetching a guild in the background, unless it's already cached
+    # or being fetched. A later get_guild() call picks up the result.
+    def prefetch_guild(self, guild_id: int) -> None:
+        if self.__cached_guild(guild_id) is None:
+            self.__guild_fetch_task(guild_id)
+
+    # Get a guild by ID. Prefers the gateway cache, then falls back to a
+    # REST fetch, done at most once per guild.
+    async def get_guild(self, guild_id: int) -> hikari.Guild:
+        guild = self.__cached_guild(guild_id)
+        if guild is not None:
+            return guild
+
+        # Shield the shared fetch, so a cancelled caller doesn't cancel it for
+        # everyone else waiting on the same guild.
+        return await asyncio.shield(self.__guild_fetch_task(guild_id))
+
+    # Forget any cached state for a guild.
+    def purge_guild(self, guild_id: int) -> None:
+        self.__guild_cache.pop(guild_id, None)
+
     # Create a new jobheader.
     async def create_jobheader(
         self,
@@ -468,7 +758,7 @@ class DiscordJobFactory(job.JobFactory):
         guild: Optional[hikari.Guild] = None
     ) -> job.JobTask:
         if guild is None:
-            guild = await self.bot.rest.fetch_guild(header.guild_id)
+            guild = await self.get_guild(header.guild_id)
 
         task_cls = self.task_registry.get(header.task_type)
         task = task_cls(self.bot, guild)
@@ -478,6 +768,8 @@ class DiscordJobFactory(job.JobFactory):
 
 # Companion to the JobFactory. No core.job counterpart.
 class DiscordCronFactory:
+    __slots__ = ("task_registry", "id_counter")
+
     def __init__(
         self,
         registry: job.TaskRegistry,
@@ -519,8 +811,14 @@ class DiscordCronFactory:
 
 # Task that sends a discord message on a timer to a given channel.
 class MessageTask(job.JobTask):
+    __slots__ = ("bot", "guild")
+
     MAX_MSG_DISPLAY_LEN = 15
 
+    # With no interval between posts, this many messages are sent at once.
+    # hikari's REST client handles any rate limiting.
+    BURST_SIZE = 5
+
     def __init__(self, bot: lightbulb.BotApp, guild: hikari.Guild):
         super().__init__()
 
@@ -532,9 +830,35 @@ class MessageTask(job.JobTask):
         channel = typing.cast(hikari.TextableChannel, self.guild.get_channel(p["channel"]))
 
         if channel is not None:
-            for _ in range(p["post_number"]):
-                await channel.send(p["message"])
-                await asyncio.sleep(p["post_interval"])
+            message = p["message"]
+            interval = p["post_interval"]
+            post_number = p["post_number"]
+            send = channel.send
+            sleep = asyncio.sleep
+
+            # No pacing needed, so send in concurrent bursts. Every message is
+            # the same, so the order they land in doesn't matter.
+            if interval == 0:
+                for start in range(0, post_number, self.BURST_SIZE):
+                    burst = min(self.BURST_SIZE, post_number - start)
+                    await asyncio.gather(*(send(message) for _ in range(burst)))
+
+                return
+
+            # Sleep until a fixed deadline rather than for a fixed interval, so
+            # send latency doesn't accumulate into drift over many posts.
+            loop = asyncio.get_running_loop()
+            deadline = loop.time()
+
+            for i in range(post_number):
+                await send(message)
+
+                # Nothing left to wait for after the last post.
+                if i == post_number - 1:
+                    break
+
+                deadline += interval
+                await sleep(max(0.0, deadline - loop.time()))
         else:
             raise Exception(f"Channel id {p['channel']} not found.")
 
@@ -542,14 +866,18 @@ class MessageTask(job.JobTask):
     def task_type(cls) -> str:
         return "message"
 
+    # Shared and read-only. JobFactory copies defaults before merging them
+    # into a header, so this doesn't need to be rebuilt for every job.
+    _DEFAULT_PROPERTIES: Mapping = MappingProxyType({
+        "message": "hello",
+        "channel": 0,
+        "post_interval": 1,  # SECONDS
+        "post_number": 1
+    })
+
     @classmethod
     def property_default(cls, properties: Mapping) -> Mapping:
-        return {
-            "message": "hello",
-            "channel": 0,
-            "post_interval": 1,  # SECONDS
-            "post_number": 1
-        }
+        return cls._DEFAULT_PROPERTIES
 
     def display(self, header: job.JobHeader) -> str:
         p = header.properties
@@ -568,7 +896,13 @@ class MessageTask(job.JobTask):
 ################
 
 class GuildStateBase:
+    # __weakref__ is needed for @reclaimable types. Subclasses without their
+    # own __slots__ still get an instance __dict__ as usual.
+    __slots__ = ("bot", "guild", "__cfg", "__cfg_set_from_deco", "__weakref__")
+
     _cfg_path: Optional[str] = None
+    _reclaimable: bool = False
+    _max_states: Optional[int] = None
 
     @classmethod
     async def get(cls: Type[GuildStateTV], ctx: lightbulb.Context) -> GuildStateTV:
@@ -632,6 +966,34 @@ def config_backed(config_path: str) -> typing.Callable[[Type[GuildStateTV]], Typ
     return deco
 
 
+def reclaimable(gs_type: Type[GuildStateTV]) -> Type[GuildStateTV]:
+    """Decorator that marks a GuildState type as reclaimable.
+
+    Instances of reclaimable types are only weakly held by Saru, and will be
+    garbage collected once nothing else references them. Only use this for
+    state that can be rebuilt from scratch, such as caches.
+    """
+    gs_type._reclaimable = True
+    return gs_type
+
+
+def bounded(max_states: int) -> typing.Callable[[Type[GuildStateTV]], Type[GuildStateTV]]:
+    """Second order decorator that limits how many instances of a GuildState
+    type Saru holds at once.
+
+    Once the limit is reached, the least recently used instance is dropped.
+    Only use this for state that can be rebuilt from scratch, such as caches.
+    """
+    if max_states < 1:
+        raise ValueError("max_states must be at least 1")
+
+    def deco(gs_type: Type[GuildStateTV]) -> Type[GuildStateTV]:
+        gs_type._max_states = max_states
+        return gs_type
+
+    return deco
+
+
 def register(bot: lightbulb.BotApp) -> typing.Callable[[Type[GuildStateTV]], Type[GuildStateTV]]:
     """Second order decorator that calls .register(bot) on the decorated
     type.
@@ -651,53 +1013,126 @@ class GuildRequiredException(GuildStateException):
     pass
 
 
+# Guild state storage for @bounded types. Keeps states in least to most
+# recently used order, and drops the oldest once over max_states. on_evict is
+# called with the key of every dropped state.
+class _BoundedStateDict(OrderedDict):
+    def __init__(self, max_states: int, on_evict: typing.Callable[[Any], None]):
+        super().__init__()
+        self.max_states = max_states
+        self.on_evict = on_evict
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+
+        while len(self) > self.max_states:
+            evicted, _ = self.popitem(last=False)
+            self.on_evict(evicted)
+
+
 # Container for guild specific state that doesn't need to be saved between runs.
 class GuildStateDB:
     def __init__(self, bot: lightbulb.BotApp):
-        self.types: MutableMapping[str, Type[GuildStateBase]] = {}
+        # Both keyed by the state class itself. Classes hash by identity,
+        # so lookups don't need to build a key first.
+        self.types: typing.Set[Type[GuildStateBase]] = set()
         self.statedb: MutableMapping[
-            str,
+            Type[GuildStateBase],
             MutableMapping[int, GuildStateBase]
         ] = {}
         self.bot = bot
 
-    @staticmethod
-    def typekey(state_type: Type[GuildStateTV]) -> str:
-        return state_type.__qualname__
+        # Reverse index of guild ID -> types with a state for that guild,
+        # so delete() only touches the types that actually hold the guild.
+        self.__by_guild: MutableMapping[int, set[Type[GuildStateBase]]] = {}
 
     def register_cls(self, state_type: Type[GuildStateTV]) -> None:
-        k = self.typekey(state_type)
-        if k in self.types:
+        if state_type in self.types:
             msg = "GuildState type {} is already registered."
             raise GuildStateException(msg.format(state_type.__name__))
 
-        self.types[k] = state_type
-        self.statedb[k] = {}
+        if state_type._reclaimable and state_type._max_states is not None:
+            msg = "GuildState type {} can't be both reclaimable and bounded."
+            raise GuildStateException(msg.format(state_type.__name__))
+
+        self.types.add(state_type)
+
+        if state_type._reclaimable:
+            self.statedb[state_type] = weakref.WeakValueDictionary()
+        elif state_type._max_states is not None:
+            self.statedb[state_type] = _BoundedStateDict(
+                state_type._max_states,
+                lambda guild_id: self.__unindex(guild_id, state_type)
+            )
+        else:
+            self.statedb[state_type] = {}
 
     def unregister_cls(self, state_type: Type[GuildStateTV]) -> None:
-        k = self.typekey(state_type)
-        self.__check_typekey(k)
+        self.__check_type(state_type)
+
+        self.types.remove(state_type)
+        del self.statedb[state_type]
+
+    # Remove a type from the reverse index entry of a guild, once its state
+    # for that guild is gone without going through delete(). That is, evicted
+    # from a @bounded type, or collected from a @reclaimable one.
+    def __unindex(self, guild_id: int, state_type: Type[GuildStateBase]) -> None:
+        states = self.statedb.get(state_type)
+        if states is not None and guild_id in states:
+            # A new state was created for the guild in the meantime.
+            return
+
+        types = self.__by_guild.get(guild_id)
+        if types is not None:
+            types.discard(state_type)
+            if not types:
+                del self.__by_guild[guild_id]
 
-        del self.types[k]
-        del self.statedb[k]
+    @staticmethod
+    def _get_guild_id(guild_entity: Optional[GuildEntity]) -> int:
+        # Plain ints are by far the most common, so check for them before
+        # walking hikari's model classes. Snowflakes are int subclasses, and
+        # are handled by the isinstance check further down.
+        if type(guild_entity) is int:
+            return guild_entity
 
-    async def _get_guild_and_id(self, guild_entity: Optional[GuildEntity]) -> tuple[hikari.Guild, int]:
         if guild_entity is None:
             raise GuildRequiredException()
 
-        if isinstance(guild_entity, hikari.Guild):
-            guild = guild_entity
-        elif isinstance(guild_entity, int):
-            guild = await self.bot.rest.fetch_guild(guild_entity)
+        if isinstance(guild_entity, int):
+            return guild_entity
+        elif isinstance(guild_entity, hikari.Guild):
+            return guild_entity.id
         else:
             raise TypeError("Guild key must be guild, or be an integer.")
 
-        return guild, guild.id
+    async def _get_guild_and_id(self, guild_entity: Optional[GuildEntity]) -> tuple[hikari.Guild, int]:
+        guild_id = self._get_guild_id(guild_entity)
 
-    def __check_typekey(self, k: str) -> None:
-        if k not in self.types:
+        if isinstance(guild_entity, hikari.Guild):
+            return guild_entity, guild_id
+
+        # Prefer the gateway cache, and only go to REST if it misses.
+        guild: Optional[hikari.Guild] = self.bot.cache.get_guild(guild_id)
+        if guild is None:
+            guild = await self.bot.rest.fetch_guild(guild_id)
+
+        return guild, guild_id
+
+    def __check_type(self, state_type: Type[GuildStateTV]) -> None:
+        if state_type not in self.types:
             msg = "GuildState type {} has not been registered."
-            raise GuildStateException(msg.format(k))
+            raise GuildStateException(msg.format(state_type.__qualname__))
 
     # Get guild state dict for a given type, and the type itself.
     def __get_of_type(
@@ -705,38 +1140,78 @@ class GuildStateDB:
         state_type: Type[GuildStateTV]
     ) -> tuple[Type[GuildStateTV], MutableMapping[int, GuildStateTV]]:
 
-        k = self.typekey(state_type)
-        self.__check_typekey(k)
+        guild_states = self.statedb.get(state_type)
+        if guild_states is None:
+            msg = "GuildState type {} has not been registered."
+            raise GuildStateException(msg.format(state_type.__qualname__))
 
         # Assume we got the right type here, since we're the ones populating it
         # in this class.
-        return (
-            typing.cast(Type[GuildStateTV], self.types[k]),
-            typing.cast(MutableMapping[int, GuildStateTV], self.statedb[k])
-        )
+        return state_type, typing.cast(MutableMapping[int, GuildStateTV], guild_states)
+
+    # Get a state instance from the DB without creating it. Returns None if
+    # there's no instance for the given guild yet.
+    def get_cached(self, state_type: Type[GuildStateTV], guild_entity: GuildEntity) -> Optional[GuildStateTV]:
+        guild_id = self._get_guild_id(guild_entity)
+        _, guild_states = self.__get_of_type(state_type)
+        return guild_states.get(guild_id)
 
     # Get a state instance from the DB. If there's no
     # instance for the given guild, one will be created.
     async def get(self, state_type: Type[GuildStateTV], guild_entity: GuildEntity) -> GuildStateTV:
-        guild, guild_id = await self._get_guild_and_id(guild_entity)
+        guild_id = self._get_guild_id(guild_entity)
         state_type, guild_states = self.__get_of_type(state_type)
 
-        try:
-            return guild_states[guild_id]
-        except KeyError:
+        # Existing states only need the ID, so don't look up the guild.
+        gs = guild_states.get(guild_id)
+        if gs is not None:
+            return gs
+
+        guild, _ = await self._get_guild_and_id(guild_entity)
+
+        # Another caller may have created the state while the guild was
+        # being fetched.
+        gs = guild_states.get(guild_id)
+        if gs is None:
             gs = state_type(self.bot, guild)
+            self.__by_guild.setdefault(guild_id, set()).add(state_type)
             guild_states[guild_id] = gs
-            return gs
+
+            if state_type._reclaimable:
+                weakref.finalize(gs, self.__unindex, guild_id, state_type)
+
+        return gs
 
     # Clear all state associated with the given guild.
     async def delete(self, guild_entity: GuildEntity) -> None:
-        _, guild_id = await self._get_guild_and_id(guild_entity)
+        if guild_entity is None:
+            raise GuildRequiredException()
+
+        # Only the ID is needed here. Don't fetch the guild, since this is
+        # usually called for a guild the bot has just left.
+        guild_id = guild_id_from_entity(guild_entity)
+
+        for state_type in self.__by_guild.pop(guild_id, ()):
+            states = self.statedb.get(state_type)
+            if states is not None:
+                states.pop(guild_id, None)
+
+    # Clear all state for guilds that aren't in guild_ids. Use this to catch
+    # up on guild leaves that were missed, e.g. while disconnected. Returns
+    # the IDs of the cleared guilds.
+    def sweep_missing(self, guild_ids: typing.Collection[int]) -> typing.List[int]:
+        removed = [g for g in self.__by_guild if g not in guild_ids]
 
-        for states in self.statedb.values():
-            if guild_id in states:
-                del states[guild_id]
+        for guild_id in removed:
+            for state_type in self.__by_guild.pop(guild_id):
+                states = self.statedb.get(state_type)
+                if states is not None:
+                    states.pop(guild_id, None)
 
-    # Iterate over all guild states of a given type
+        return removed
+
+    # Iterate over all guild states of a given type. For @reclaimable types,
+    # states that have already been collected are skipped.
     def iter_over_type(self, state_type: Type[GuildStateTV]) -> Iterator[GuildStateTV]:
         state_type, guild_states = self.__get_of_type(state_type)
         yield from guild_states.values()
@@ -784,6 +1259,12 @@ def config_command(
             f"Get/set {config_key.replace('_', ' ').lower()}"
             if not description else description
         )
+        display_name = config_key.replace("_", " ").capitalize()
+
+        # Resolved once here, instead of on every invocation.
+        permissions_for = lightbulb.utils.permissions_for
+        perm_admin = hikari.Permissions.ADMINISTRATOR
+        perm_none = hikari.Permissions.NONE
 
         @lightbulb.option(
             "value",
@@ -801,10 +1282,12 @@ def config_command(
             if ctx.guild_id is None:
                 raise ValueError("ctx must have guild id")
 
-            if not isinstance(ctx.event, hikari.MessageCreateEvent):
+            event = ctx.event
+            if not isinstance(event, hikari.MessageCreateEvent):
                 raise NotImplementedError("not implemented for non-message ctx")
 
-            if ctx.event.message.member is None:
+            member = event.message.member
+            if member is None:
                 raise ValueError("ctx must have a member (invoke in guild only)")
 
             cfg: config.Config = get(ctx).cfg(path, ctx.guild_id)
@@ -817,35 +1300,28 @@ def config_command(
 
             # GET
             if value is None:
-                display_name = config_key.replace("_", " ").capitalize()
                 value = cfg.get(config_key)
                 await ctx.respond(f"{display_name} is {value}.")
                 return
 
             # SET
             if require_admin:
-                perms = lightbulb.utils.permissions_for(
-                    ctx.event.message.member
-                )
+                guild = ctx.get_guild()
 
-                maybe_guild = ctx.get_guild()
-
-                if maybe_guild is None:
+                if guild is None:
                     raise Exception("Could not get guild from context.")
-                else:
-                    guild = maybe_guild
-
-                is_admin = (
-                    perms & hikari.Permissions.ADMINISTRATOR or
-                    ctx.author.id == guild.owner_id
-                )
-
-                if perms == hikari.Permissions.NONE:
-                    await ctx.respond("Internal error: cache not available")
-                    return
-                elif not is_admin:
-                    await ctx.respond("You must be administrator to set this value.")
-                    return
+
+                # The owner is always allowed, so only work out permissions
+                # for everyone else.
+                if ctx.author.id != guild.owner_id:
+                    perms = permissions_for(member)
+
+                    if perms == perm_none:
+                        await ctx.respond("Internal error: cache not available")
+                        return
+                    elif not perms & perm_admin:
+                        await ctx.respond("You must be administrator to set this value.")
+                        return
 
             await coro(ctx, cfg, config_key, value)
             cfg[config_key] = value
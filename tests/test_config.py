@@ -1,3 +1,7 @@
+import copy
+import math
+import pathlib
+import types
 import typing
 
 import pytest
@@ -30,16 +34,45 @@ NULL_BACKEND_FACTORIES = [
     SubConfigFactory()
 ]
 
+# Standard template paths for testing.
+TEMPLATE_PATHS: typing.Mapping[str, saru.ConfigValueT] = types.MappingProxyType({
+    "a/b/c": TEST_VALUE,
+    "a/b/d": TEST_VALUE,
+    "a/c/val1": 1,
+    "a/c/val2": 2
+})
+
+# Expected structure of a config object after applying TEMPLATE_PATHS.
+TEMPLATE_EXPECTED_STRUCTURE: typing.Mapping[str, saru.ConfigValueT] = types.MappingProxyType({
+    "a": {
+        "b": {
+            "c": TEST_VALUE,
+            "d": TEST_VALUE
+        },
+        "c": {
+            "val1": 1,
+            "val2": 2
+        }
+    }
+})
+
+
+@pytest.fixture(params=NULL_BACKEND_FACTORIES, ids=["base", "sub"])
+def cf(request: pytest.FixtureRequest) -> ConfigFactory:
+    return typing.cast(ConfigFactory, request.param)
+
+
+@pytest.fixture
+def c(cf: ConfigFactory) -> saru.Config:
+    return cf.new_config()
+
 
-@pytest.mark.parametrize("cf", NULL_BACKEND_FACTORIES)
 class TestConfigInterface:
     """
     Generic tests for the configuration interface. Add config factories
     to ensure that all Config implementations follow expected behavior.
     """
-    def test_pathget(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
-
+    def test_pathget(self, c: saru.Config) -> None:
         c.root["a"] = {
             "b": {
                 "c": TEST_VALUE
@@ -48,14 +81,11 @@ class TestConfigInterface:
 
         assert c["a/b/c"] == TEST_VALUE
 
-    def test_pathset(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
+    def test_pathset(self, c: saru.Config) -> None:
         c["a/b/c"] = TEST_VALUE
         assert c.root["a"]["b"]["c"] == TEST_VALUE
 
-    def test_pathdel(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
-
+    def test_pathdel(self, c: saru.Config) -> None:
         c.root["a"] = {
             "b": {
                 "c": TEST_VALUE
@@ -68,24 +98,21 @@ class TestConfigInterface:
         assert "b" in c.root["a"]
         assert c.root["a"]["b"] == {}
 
-    def test_len(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
+    def test_len(self, c: saru.Config) -> None:
         c.root["a"] = TEST_VALUE
         c.root["b"] = TEST_VALUE
         c.root["c"] = TEST_VALUE
 
         assert len(c) == len(c.root)
 
-    def test_iter(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
+    def test_iter(self, c: saru.Config) -> None:
         c.root["a"] = TEST_VALUE
         c.root["b"] = TEST_VALUE
         c.root["c"] = TEST_VALUE
 
         assert [x for x in c] == ["a", "b", "c"]
 
-    def test_contains(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
+    def test_contains(self, c: saru.Config) -> None:
         c.root["a"] = {
             "b": {
                 "c": TEST_VALUE
@@ -100,8 +127,7 @@ class TestConfigInterface:
         assert "a/c" not in c
         assert "a/b/c/d" not in c
 
-    def test_normalized_paths(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
+    def test_normalized_paths(self, c: saru.Config) -> None:
         c["a/b/c"] = TEST_VALUE
 
         # Config objects should respect path normalization.
@@ -110,23 +136,19 @@ class TestConfigInterface:
         assert c["a/b/c"] == c["/a/b/c/"]
         assert c["a/b/c"] == c["///a//b/////c//"]
 
-    def test_empty_path_error(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
-
+    def test_empty_path_error(self, c: saru.Config) -> None:
         # Use of blank strings is not allowed.
         with pytest.raises(saru.ConfigPathException):
             c[""] = TEST_VALUE
 
-    def test_pathset_collision(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
+    def test_pathset_collision(self, c: saru.Config) -> None:
         c["a/b/c"] = TEST_VALUE
 
         # a/b/c is a str, so we shouldn't be able to set a/b/c/d.
         with pytest.raises(saru.ConfigPathException):
             c["a/b/c/d"] = TEST_VALUE
 
-    def test_pathget_missing(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
+    def test_pathget_missing(self, c: saru.Config) -> None:
         c["a/b"] = TEST_VALUE
         assert "a" in c.root
         assert "b" in c.root["a"]
@@ -139,23 +161,19 @@ class TestConfigInterface:
         with pytest.raises(saru.ConfigPathException):
             _ = c["a/nonexist/suffix"]
 
-    def test_subconfig_pathget(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
+    def test_subconfig_pathget(self, c: saru.Config) -> None:
         sub = c.sub("subconf")
 
         c.root["subconf"]["value"] = TEST_VALUE
         assert sub["value"] == c["subconf/value"]
 
-    def test_subconfig_pathset(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
+    def test_subconfig_pathset(self, c: saru.Config) -> None:
         sub = c.sub("subconf")
         sub["a/b/c"] = TEST_VALUE
 
         assert c.root["subconf"]["a"]["b"]["c"] == sub.root["a"]["b"]["c"]
 
-    def test_subconfig_pathdel(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
-
+    def test_subconfig_pathdel(self, c: saru.Config) -> None:
         c.root["subconf"] = {
             "a": {
                 "b": {
@@ -169,8 +187,7 @@ class TestConfigInterface:
 
         assert "c" not in c.root["subconf"]["a"]["b"]
 
-    def test_subconfig_iter(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
+    def test_subconfig_iter(self, c: saru.Config) -> None:
         c.root["subconf"] = {
             "a": TEST_VALUE,
             "b": TEST_VALUE,
@@ -190,13 +207,7 @@ class TestConfigTemplate:
         """
         Standard template for testing.
         """
-        template = saru.ConfigTemplate({
-            "a/b/c": TEST_VALUE,
-            "a/b/d": TEST_VALUE,
-            "a/c/val1": 1,
-            "a/c/val2": 2
-        })
-        return template
+        return saru.ConfigTemplate(copy.deepcopy(dict(TEMPLATE_PATHS)))
 
     @staticmethod
     def get_expected_structure() -> typing.Mapping[str, saru.ConfigValueT]:
@@ -204,31 +215,16 @@ class TestConfigTemplate:
         Expected structure of a config object constructed by
         `TestConfigTemplate.get_template`.
         """
-        return {
-            "a": {
-                "b": {
-                    "c": TEST_VALUE,
-                    "d": TEST_VALUE
-                },
-                "c": {
-                    "val1": 1,
-                    "val2": 2
-                }
-            }
-        }
+        return copy.deepcopy(dict(TEMPLATE_EXPECTED_STRUCTURE))
 
-    @pytest.mark.parametrize("cf", NULL_BACKEND_FACTORIES)
-    def test_empty_apply(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
+    def test_empty_apply(self, c: saru.Config) -> None:
         template = self.get_template()
         expected_structure = self.get_expected_structure()
 
         template.apply(c)
         assert c.root == expected_structure
 
-    @pytest.mark.parametrize("cf", NULL_BACKEND_FACTORIES)
-    def test_partially_filled_apply(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
+    def test_partially_filled_apply(self, c: saru.Config) -> None:
         c["a/b/c"] = TEST_VALUE
         c["a/c/val1"] = 1
 
@@ -238,9 +234,7 @@ class TestConfigTemplate:
         template.apply(c)
         assert c.root == expected_structure
 
-    @pytest.mark.parametrize("cf", NULL_BACKEND_FACTORIES)
-    def test_total_filled_apply(self, cf: ConfigFactory) -> None:
-        c = cf.new_config()
+    def test_total_filled_apply(self, c: saru.Config) -> None:
         template = self.get_template()
         expected_structure = self.get_expected_structure()
 
@@ -249,6 +243,41 @@ class TestConfigTemplate:
         template.apply(c)
         assert c.root == expected_structure
 
+    def test_apply_does_not_share_values(self) -> None:
+        template = saru.ConfigTemplate({
+            "a/b": {}
+        })
+
+        c1 = BaseConfigFactory.new_config()
+        c2 = BaseConfigFactory.new_config()
+        template.apply(c1)
+        template.apply(c2)
+
+        # Each config must get its own copy of mutable template values.
+        c1["a/b/c"] = TEST_VALUE
+        assert c2.root == {"a": {"b": {}}}
+
+    @pytest.mark.parametrize("paths", [
+        {"a": {"c": TEST_VALUE}, "a/b": TEST_VALUE},
+        {"a/b": TEST_VALUE, "a": {"c": TEST_VALUE}}
+    ])
+    def test_mapping_value_with_child_paths(
+        self,
+        c: saru.Config,
+        paths: typing.Mapping[str, saru.ConfigValueT]
+    ) -> None:
+        template = saru.ConfigTemplate(paths)
+
+        # A missing mapping is filled in, then the paths below it.
+        template.apply(c)
+        assert c.root == {"a": {"b": TEST_VALUE, "c": TEST_VALUE}}
+
+        # An existing mapping only gets the paths below it.
+        del c["a/b"]
+        del c["a/c"]
+        template.apply(c)
+        assert c.root == {"a": {"b": TEST_VALUE}}
+
     # Can't use null backend factories for this one, since we need a non-null
     # backend.
     def test_rollback_on_error(self) -> None:
@@ -260,10 +289,9 @@ class TestConfigTemplate:
         c.write()
 
         template = saru.ConfigTemplate(
-            rollback_on_failure=True,
             paths={
                 "possible": TEST_VALUE,  # This will work
-                "config_value/impossible": TEST_VALUE  # This won't, causing rollback.
+                "config_value/impossible": TEST_VALUE  # This won't, so nothing is applied.
             }
         )
 
@@ -288,3 +316,65 @@ class TestConfigTemplate:
 
         # Should not reach this.
         assert False
+
+    def test_rollback_on_failure_deprecated(self) -> None:
+        with pytest.warns(DeprecationWarning):
+            saru.ConfigTemplate({}, rollback_on_failure=True)
+
+
+class TestJsonConfigBackend:
+    """
+    Tests for the JSON file backend.
+    """
+
+    def test_write_read_roundtrip(self, tmp_path: pathlib.Path) -> None:
+        backend = saru.JsonConfigBackend(tmp_path / "cfg.json")
+
+        # Values that not every JSON serializer handles the same way.
+        backend.write({
+            "big": 2 ** 70,
+            "nan": float("nan"),
+            "inf": float("inf"),
+            "text": "\u00e9",
+            "nested": {"a": [1, 2]}
+        })
+
+        data = backend.read()
+        assert data["big"] == 2 ** 70
+        assert math.isnan(data["nan"])
+        assert data["inf"] == float("inf")
+        assert data["text"] == "\u00e9"
+        assert data["nested"] == {"a": [1, 2]}
+
+    def test_write_format(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "cfg.json"
+        saru.JsonConfigBackend(path).write({"a": {"b": "\u00e9"}})
+
+        # 4 space indent, with non-ASCII characters escaped.
+        assert path.read_text(encoding="utf-8") == '{\n    "a": {\n        "b": "\\u00e9"\n    }\n}'
+
+
+class TestJsonConfigDirectory:
+    """
+    Tests for the JSON config directory.
+    """
+
+    def test_generation(self, tmp_path: pathlib.Path) -> None:
+        d = saru.JsonConfigDirectory(tmp_path / "cfgdir")
+        d.load()
+        gen = d.generation
+
+        # Replacing config objects must bump the generation, so cached
+        # lookups can be thrown out.
+        d.create_config(1)
+        assert d.generation > gen
+        gen = d.generation
+
+        d.load()
+        assert d.generation > gen
+        gen = d.generation
+
+        # Looking up existing configs doesn't.
+        d.ensure_exists(1)
+        assert d[1] is d[1]
+        assert d.generation == gen
@@ -0,0 +1,54 @@
+import typing
+
+import pytest
+import saru
+
+
+class TestCodeJson:
+    """
+    Tests for JSON code block formatting.
+    """
+
+    def test_format(self) -> None:
+        assert saru.codejson({"a": [1]}) == '```json\n{\n    "a": [\n        1\n    ]\n}\n```'
+
+    def test_non_ascii(self) -> None:
+        # Non-ASCII text is shown as-is, not escaped.
+        assert '"é"' in saru.codejson({"a": "é"})
+
+    def test_non_finite(self) -> None:
+        s = saru.codejson({"nan": float("nan"), "inf": float("inf")})
+        assert '"nan": NaN' in s
+        assert '"inf": Infinity' in s
+
+    def test_big_int(self) -> None:
+        assert str(2 ** 70) in saru.codejson({"big": 2 ** 70})
+
+
+class TestRangeLimit:
+    """
+    Tests for range checks.
+    """
+
+    @pytest.mark.parametrize("low,val,high", [
+        (0, 5, 10),
+        (0, 0, 10),
+        (0, 10, 10),
+        (None, -5, 10),
+        (0, 50, None)
+    ])
+    def test_in_range(self, low: typing.Optional[float], val: float, high: typing.Optional[float]) -> None:
+        saru.rangelimit(low, val, high, "val")
+
+    @pytest.mark.parametrize("low,val,high", [
+        (0, -1, 10),
+        (0, 11, 10),
+        (None, 11, 10),
+        (0, -1, None),
+        (0, float("nan"), 10),
+        (None, float("nan"), 10),
+        (0, float("nan"), None)
+    ])
+    def test_out_of_range(self, low: typing.Optional[float], val: float, high: typing.Optional[float]) -> None:
+        with pytest.raises(saru.RangeLimitError):
+            saru.rangelimit(low, val, high, "val")
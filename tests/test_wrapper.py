@@ -0,0 +1,275 @@
+import asyncio
+import gc
+import pathlib
+import types
+import typing
+
+import pytest
+import saru
+from saru import wrapper
+
+
+class FakeBot:
+    """
+    Just enough of a bot for GuildStateDB and Saru to work with.
+    """
+
+    def __init__(self) -> None:
+        self.d = types.SimpleNamespace()
+        self.cache = types.SimpleNamespace(get_guild=lambda guild_id: None)
+        self.rest = types.SimpleNamespace(fetch_guild=self.fetch_guild)
+
+    async def fetch_guild(self, guild_id: int) -> typing.Any:
+        return types.SimpleNamespace(id=guild_id, name=str(guild_id))
+
+    def subscribe(self, event_type: typing.Any, callback: typing.Any) -> None:
+        pass
+
+
+class TestGuildStateDB:
+    """
+    Tests for guild state storage.
+    """
+
+    @pytest.fixture
+    def db(self) -> saru.GuildStateDB:
+        return saru.GuildStateDB(typing.cast(typing.Any, FakeBot()))
+
+    def test_bounded_evicts_lru(self, db: saru.GuildStateDB) -> None:
+        @saru.bounded(2)
+        class State(saru.GuildStateBase):
+            pass
+
+        db.register_cls(State)
+
+        async def run() -> None:
+            await db.get(State, 1)
+            await db.get(State, 2)
+
+            # Touch 1, so 2 is the least recently used.
+            await db.get(State, 1)
+            await db.get(State, 3)
+
+        asyncio.run(run())
+
+        assert db.get_cached(State, 2) is None
+        assert db.get_cached(State, 1) is not None
+        assert db.get_cached(State, 3) is not None
+
+        # The evicted guild is gone from the guild index too.
+        assert sorted(db.sweep_missing(set())) == [1, 3]
+
+    def test_reclaimable_collected(self, db: saru.GuildStateDB) -> None:
+        @saru.reclaimable
+        class State(saru.GuildStateBase):
+            pass
+
+        db.register_cls(State)
+
+        state = asyncio.run(db.get(State, 1))
+        assert db.get_cached(State, 1) is state
+
+        del state
+        gc.collect()
+
+        assert db.get_cached(State, 1) is None
+        assert db.sweep_missing(set()) == []
+
+    def test_sweep_missing(self, db: saru.GuildStateDB) -> None:
+        class State(saru.GuildStateBase):
+            pass
+
+        db.register_cls(State)
+
+        async def run() -> None:
+            await db.get(State, 1)
+            await db.get(State, 2)
+
+        asyncio.run(run())
+
+        assert db.sweep_missing({1}) == [2]
+        assert db.get_cached(State, 1) is not None
+        assert db.get_cached(State, 2) is None
+
+
+class TestBoundedStateDict:
+    """
+    Tests for the LRU dict backing @bounded guild states.
+    """
+
+    def test_evicts_oldest(self) -> None:
+        evicted: typing.List[int] = []
+        d = wrapper._BoundedStateDict(2, evicted.append)
+
+        d[1] = "a"
+        d[2] = "b"
+        d.get(1)
+        d[3] = "c"
+
+        assert list(d) == [1, 3]
+        assert evicted == [2]
+
+
+class CountingConfig:
+    """
+    Stand-in config that only counts writes.
+    """
+
+    def __init__(self) -> None:
+        self.writes = 0
+
+    def write(self) -> None:
+        self.writes += 1
+
+
+class TestDirtyWriter:
+    """
+    Tests for coalesced config writes.
+    """
+
+    def test_marks_coalesce(self) -> None:
+        writer = wrapper._DirtyWriter()
+        a, b = CountingConfig(), CountingConfig()
+
+        async def run() -> None:
+            for _ in range(5):
+                writer.mark(typing.cast(typing.Any, a))
+            writer.mark(typing.cast(typing.Any, b))
+
+            # Nothing is written until the flush delay has passed.
+            assert a.writes == 0
+            await asyncio.sleep(writer.FLUSH_DELAY * 4)
+
+        asyncio.run(run())
+
+        assert a.writes == 1
+        assert b.writes == 1
+
+    def test_flush(self) -> None:
+        writer = wrapper._DirtyWriter()
+        cfg = CountingConfig()
+
+        async def run() -> None:
+            writer.mark(typing.cast(typing.Any, cfg))
+            writer.flush()
+            assert cfg.writes == 1
+
+            # The pending delayed flush was cancelled, so there's no
+            # second write.
+            await asyncio.sleep(writer.FLUSH_DELAY * 4)
+
+        asyncio.run(run())
+
+        assert cfg.writes == 1
+
+
+class TestConfigCache:
+    """
+    Tests for the per-guild config lookup cache.
+    """
+
+    @pytest.fixture
+    def directory(self, tmp_path: pathlib.Path) -> saru.JsonConfigDirectory:
+        d = saru.JsonConfigDirectory(tmp_path / "cfgdir")
+        d.load()
+        return d
+
+    def test_get(self, directory: saru.JsonConfigDirectory) -> None:
+        cache = wrapper._ConfigCache(directory)
+
+        cfg = cache.get(1)
+        assert 1 in directory
+        assert cache.get(1) is cfg
+
+    def test_generation_change(self, directory: saru.JsonConfigDirectory) -> None:
+        cache = wrapper._ConfigCache(directory)
+
+        old = cache.get(1)
+        directory.create_config(1)
+        assert cache.get(1) is directory[1]
+        assert cache.get(1) is not old
+
+        old = cache.get(1)
+        directory.load()
+        assert cache.get(1) is directory[1]
+        assert cache.get(1) is not old
+
+    def test_retain(self, directory: saru.JsonConfigDirectory) -> None:
+        cache = wrapper._ConfigCache(directory)
+        cache.get(1)
+        cache.get(2)
+
+        assert cache.retain({1}) == [2]
+        assert cache.retain({1}) == []
+
+
+class TestSaru:
+    """
+    Tests for the Saru container itself.
+    """
+
+    @pytest.fixture
+    def bot(self, tmp_path: pathlib.Path) -> FakeBot:
+        bot = FakeBot()
+        saru.attach(typing.cast(typing.Any, bot), tmp_path, saru.ConfigTemplate({}))
+        return bot
+
+    def test_sweep_guilds(self, bot: FakeBot, monkeypatch: pytest.MonkeyPatch) -> None:
+        s: saru.Saru = bot.d.saru
+        purged: typing.List[int] = []
+        monkeypatch.setattr(wrapper.DiscordJobFactory, "purge_guild", lambda self, g: purged.append(g))
+
+        class State(saru.GuildStateBase):
+            pass
+
+        s.gstype(State)
+
+        # Guild 3 is joined while the guild list is being fetched, so it's
+        # missing from the list.
+        async def fetch_my_guilds() -> typing.AsyncIterator[typing.Any]:
+            yield types.SimpleNamespace(id=1)
+            await s.on_bot_guild_join(typing.cast(typing.Any, types.SimpleNamespace(
+                guild=types.SimpleNamespace(id=3, name="3")
+            )))
+
+        bot.rest.fetch_my_guilds = fetch_my_guilds
+
+        async def run() -> None:
+            for guild_id in (1, 2, 3):
+                await s.gs(State, guild_id)
+                s.gcfg(guild_id)
+
+            await s.sweep_guilds()
+
+        asyncio.run(run())
+
+        assert s.gs_db.get_cached(State, 1) is not None
+        assert s.gs_db.get_cached(State, 2) is None
+        assert s.gs_db.get_cached(State, 3) is not None
+        assert purged == [2]
+
+    def test_reschedule_failure_kept(self, bot: FakeBot, monkeypatch: pytest.MonkeyPatch) -> None:
+        s: saru.Saru = bot.d.saru
+        s.job_db.ensure_exists(1)
+        s.job_db[1]["cron/1"] = {"id": 1}
+        s.job_db[1]["cron/2"] = {"id": 2}
+        s.job_db[1].write()
+
+        # Fail slowly, so the section clear is written out before the
+        # failure is handled.
+        async def reschedule_cron(self: saru.Saru, header: typing.Mapping) -> None:
+            await asyncio.sleep(wrapper._DirtyWriter.FLUSH_DELAY * 2)
+            if header["id"] == 2:
+                raise ValueError("bad schedule")
+
+        monkeypatch.setattr(saru.Saru, "reschedule_cron", reschedule_cron)
+
+        async def run() -> None:
+            await s.reschedule_all_cron()
+            await asyncio.sleep(wrapper._DirtyWriter.FLUSH_DELAY * 4)
+
+        asyncio.run(run())
+
+        # The failed entry made it back to disk.
+        s.job_db.load()
+        assert s.job_db[1]["cron/2"] == {"id": 2}